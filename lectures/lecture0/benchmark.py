@@ -0,0 +1,107 @@
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from maze import Maze, STRATEGIES
+
+
+def generate(height, width, openness=0.0, seed=0):
+    """
+    Returns the text of a random maze of about `height` x `width` cells,
+    with A in the top-left corner and B in the bottom-right corner.
+
+    The maze is carved by a randomized depth-first search, so it has a
+    single path between any two cells; `openness` is the fraction of the
+    remaining inner walls knocked down afterwards to add loops.
+    """
+    rng = random.Random(seed)
+    rows, cols = (height - 1) // 2, (width - 1) // 2
+    grid = [bytearray(b"#" * (2 * cols + 1)) for _ in range(2 * rows + 1)]
+
+    # Carve passages with an explicit stack
+    grid[1][1] = ord(" ")
+    stack = [(0, 0)]
+    visited = {(0, 0)}
+    while stack:
+        r, c = stack[-1]
+        options = [
+            (r + dr, c + dc) for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+            if 0 <= r + dr < rows and 0 <= c + dc < cols
+            and (r + dr, c + dc) not in visited
+        ]
+        if not options:
+            stack.pop()
+            continue
+        nr, nc = rng.choice(options)
+        grid[r + nr + 1][c + nc + 1] = ord(" ")
+        grid[2 * nr + 1][2 * nc + 1] = ord(" ")
+        visited.add((nr, nc))
+        stack.append((nr, nc))
+
+    # Knock down some walls between cells to create loops
+    for i in range(1, 2 * rows):
+        for j in range(1, 2 * cols):
+            if (i + j) % 2 == 1 and grid[i][j] == ord("#"):
+                if rng.random() < openness:
+                    grid[i][j] = ord(" ")
+
+    grid[1][1] = ord("A")
+    grid[2 * rows - 1][2 * cols - 1] = ord("B")
+    return b"\n".join(bytes(row) for row in grid).decode()
+
+
+def peak_memory(function, *args):
+    """Returns the peak bytes allocated while calling function(*args)."""
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(size, openness):
+    """
+    Solves one generated maze with every strategy and heuristic and
+    prints states explored, solution length, wall time and the peak
+    memory allocated while loading and solving. Memory is traced in a
+    second run, so tracing does not slow down the timed one.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(generate(size, size, openness))
+    try:
+        start = time.perf_counter()
+        maze = Maze(f.name)
+        elapsed = time.perf_counter() - start
+        peak = peak_memory(Maze, f.name)
+    finally:
+        os.remove(f.name)
+
+    print(f"{maze.height}x{maze.width} maze, openness {openness}: "
+          f"loaded in {elapsed:.2f} s, peak {peak / 2 ** 20:.1f} MiB")
+    runs = [(strategy, "manhattan") for strategy in STRATEGIES]
+    runs += [("greedy", "euclidean"), ("astar", "euclidean")]
+    for strategy, heuristic in runs:
+        start = time.perf_counter()
+        maze.solve(strategy, heuristic)
+        elapsed = time.perf_counter() - start
+        peak = peak_memory(maze.solve, strategy, heuristic)
+        name = strategy if strategy in ["dfs", "bfs"] else f"{strategy}/{heuristic}"
+        print(f"{name:>18}: {maze.num_explored:>9} explored, "
+              f"path {len(maze.solution[0]):>7}, {elapsed:>7.2f} s, "
+              f"peak {peak / 2 ** 20:>7.1f} MiB")
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark.py [size]")
+    size = int(sys.argv[1]) if len(sys.argv) == 2 else 1001
+    for openness in (0.0, 0.3):
+        benchmark(size, openness)
+
+
+if __name__ == "__main__":
+    main()
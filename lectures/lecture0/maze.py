@@ -1,32 +1,48 @@
+import heapq
+import itertools
+import math
 import sys
+from array import array
+from collections import deque
 
-class Node():
-    def __init__(self, state, parent, action):
-        self.state = state
-        self.parent = parent
-        self.action = action
+# Mazes are stored as flat arrays indexed by cell number i * width + j,
+# so that walls, explored cells and parent links take one compact array
+# each instead of a Python object per cell.
+
+# Maps maze file characters to 1 for walls and 0 for open cells
+WALLS = bytes(0 if chr(c) in " AB" else 1 for c in range(256))
 
 
 class StackFrontier():
-    def __init__(self):
-        self.frontier = []
+    """Frontier of cell numbers that removes the latest added first."""
+
+    def __init__(self, size):
+        self.frontier = deque()
+
+        # Number of times each of the `size` cells is in the frontier, so
+        # membership checks do not have to scan the whole frontier
+        self.states = bytearray(size)
 
-    def add(self, node):
-        self.frontier.append(node)
+    def add(self, cell, cost=0):
+        self.frontier.append(cell)
+        self.states[cell] += 1
+        return True
 
-    def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+    def contains_state(self, cell):
+        return self.states[cell] != 0
 
     def empty(self):
         return len(self.frontier) == 0
 
+    def untrack(self, cell):
+        self.states[cell] -= 1
+        return cell
+
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
-            return node
+            return self.untrack(self.frontier.pop())
 
 
 class QueueFrontier(StackFrontier):
@@ -35,54 +51,162 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
+            return self.untrack(self.frontier.popleft())
+
+
+class PriorityFrontier():
+    """
+    Frontier of cell numbers that removes the cell with the lowest
+    priority first.
+
+    `add` only adds a cell reached more cheaply than by any cell added
+    before it, and returns whether it did; stale entries left behind are
+    skipped by the solver, which ignores cells it has already explored.
+    """
+
+    def __init__(self, size, priority):
+        self.frontier = []
+        self.priority = priority
+
+        # Cheapest cost each cell was added with, or -1
+        self.costs = array("i", [-1]) * size
+        self.counter = itertools.count()
+
+    def add(self, cell, cost=0):
+        if -1 < self.costs[cell] <= cost:
+            return False
+        self.costs[cell] = cost
+        heapq.heappush(
+            self.frontier, self.priority(cell, cost) + (next(self.counter), cell)
+        )
+        return True
+
+    def contains_state(self, cell):
+        return self.costs[cell] != -1
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            return heapq.heappop(self.frontier)[-1]
+
+
+def manhattan(state, goal):
+    return abs(state[0] - goal[0]) + abs(state[1] - goal[1])
+
+
+def euclidean(state, goal):
+    return math.hypot(state[0] - goal[0], state[1] - goal[1])
+
+
+HEURISTICS = {
+    "manhattan": manhattan,
+    "euclidean": euclidean,
+}
+
+STRATEGIES = ["dfs", "bfs", "greedy", "astar"]
+
+
+class Cells():
+    """
+    Read-only set-like view of the (i, j) cells marked in a bytearray
+    bitmap of a maze.
+    """
+
+    def __init__(self, bitmap, width):
+        self.bitmap = bitmap
+        self.width = width
+        self.height = len(bitmap) // width
+
+    def __contains__(self, state):
+        i, j = state
+        return (
+            0 <= i < self.height and 0 <= j < self.width
+            and self.bitmap[i * self.width + j] == 1
+        )
+
+    def __iter__(self):
+        for cell, marked in enumerate(self.bitmap):
+            if marked:
+                yield divmod(cell, self.width)
+
+    def __len__(self):
+        return self.bitmap.count(1)
+
+
+def find_all(line, character):
+    """Returns the positions of a character in a line of bytes."""
+    position = line.find(character)
+    while position != -1:
+        yield position
+        position = line.find(character, position + 1)
+
 
 class Maze():
 
     def __init__(self, filename):
 
-        # Read file and set height and width of maze
-        with open(filename) as f:
-            contents = f.read()
+        # Read the file a line at a time, so only the grid is kept
+        self.height = 0
+        self.width = 0
+        self.cells = bytearray()
+        starts = []
+        goals = []
+        with open(filename, "rb") as f:
+            for line in f:
+                line = line.rstrip(b"\r\n")
+
+                # Each non-ASCII character is a single wall
+                if not line.isascii():
+                    line = line.decode().encode("ascii", "replace")
+
+                # Keep track of start and goal
+                if b"A" in line:
+                    starts += [(self.height, j) for j in find_all(line, b"A")]
+                if b"B" in line:
+                    goals += [(self.height, j) for j in find_all(line, b"B")]
+
+                # Keep track of walls, one byte per cell, padding short
+                # lines with open cells
+                if len(line) > self.width:
+                    self.widen(len(line))
+                row = line.translate(WALLS)
+                self.cells += row + bytes(self.width - len(row))
+                self.height += 1
 
         # Validate start and goal
-        if contents.count("A") != 1:
+        if len(starts) != 1:
             raise Exception("maze must have exactly one start point")
-        if contents.count("B") != 1:
+        if len(goals) != 1:
             raise Exception("maze must have exactly one goal")
+        self.start = starts[0]
+        self.goal = goals[0]
+
+        # Rows of the wall grid, indexable as walls[i][j]
+        view = memoryview(self.cells)
+        self.walls = [
+            view[i * self.width:(i + 1) * self.width]
+            for i in range(self.height)
+        ]
 
-        # Determine height and width of maze
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
+        self.solution = None
 
-        # Keep track of walls
-        self.walls = []
+    def widen(self, width):
+        """Pads the rows read so far with open cells to a wider width."""
+        padding = bytes(width - self.width)
+        cells = bytearray()
         for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
-
-        self.solution = None
+            cells += self.cells[i * self.width:(i + 1) * self.width]
+            cells += padding
+        self.cells = cells
+        self.width = width
 
 
     def print(self):
-        solution = self.solution[1] if self.solution is not None else None
+        solution = set(self.solution[1]) if self.solution is not None else None
         print()
         for i, row in enumerate(self.walls):
             for j, col in enumerate(row):
@@ -111,24 +235,67 @@ class Maze():
 
         result = []
         for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
+            if 0 <= r < self.height and 0 <= c < self.width and not self.cells[r * self.width + c]:
                 result.append((action, (r, c)))
         return result
 
 
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+    def frontier(self, strategy, heuristic):
+        """Returns an empty frontier of cell numbers for a search strategy."""
+        size = self.height * self.width
+        if strategy == "dfs":
+            return StackFrontier(size)
+        if strategy == "bfs":
+            return QueueFrontier(size)
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown strategy {strategy}")
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"unknown heuristic {heuristic}")
+
+        # Greedy best-first goes by distance to the goal alone, A* adds
+        # the cost so far; ties go to the cell nearer the goal
+        estimate = HEURISTICS[heuristic]
+        goal = self.goal
+        width = self.width
+        if strategy == "greedy":
+            def priority(cell, cost):
+                distance = estimate(divmod(cell, width), goal)
+                return (distance, distance)
+        else:
+            def priority(cell, cost):
+                distance = estimate(divmod(cell, width), goal)
+                return (cost + distance, distance)
+        return PriorityFrontier(size, priority)
+
+    def solve(self, strategy="dfs", heuristic="manhattan"):
+        """
+        Finds a solution to maze, if one exists.
+
+        `strategy` is one of "dfs", "bfs", "greedy" (greedy best-first)
+        or "astar", and `heuristic` is "manhattan" or "euclidean" for the
+        last two.
+        """
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"unknown heuristic {heuristic}")
+        width, cells = self.width, self.cells
+        size = self.height * width
+        start = self.start[0] * width + self.start[1]
+        goal = self.goal[0] * width + self.goal[1]
 
         # Keep track of number of states explored
         self.num_explored = 0
 
         # Initialize frontier to just the starting position
-        start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
-        frontier.add(start)
+        frontier = self.frontier(strategy, heuristic)
+        frontier.add(start, 0)
+        priority = isinstance(frontier, PriorityFrontier)
 
-        # Initialize an empty explored set
-        self.explored = set()
+        # Explored cells, and the parent of each cell added to the
+        # frontier, by cell number; only a priority frontier needs costs,
+        # which it keeps itself
+        explored = bytearray(size)
+        parents = array("i", [-1]) * size
+        self.explored = Cells(explored, width)
 
         # Keep looping until solution found
         while True:
@@ -137,93 +304,112 @@ class Maze():
             if frontier.empty():
                 raise Exception("no solution")
 
-            # Choose a node from the frontier
-            node = frontier.remove()
+            # Choose a cell from the frontier, skipping cells that were
+            # reached again more cheaply and already explored
+            cell = frontier.remove()
+            if explored[cell]:
+                continue
             self.num_explored += 1
 
-            # If node is the goal, then we have a solution
-            if node.state == self.goal:
-                actions = []
-                cells = []
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
-                return
-
-            # Mark node as explored
-            self.explored.add(node.state)
-
-            # Add neighbors to frontier
-            for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
-                    frontier.add(child)
-
-
-    def output_image(self, filename, show_solution=True, show_explored=False):
-        from PIL import Image, ImageDraw
+            # If cell is the goal, then we have a solution
+            if cell == goal:
+                return self.trace(parents, start, goal)
+
+            # Mark cell as explored
+            explored[cell] = 1
+
+            # Add open neighbors, up, down, left then right, to frontier;
+            # a priority frontier decides itself whether a cell already in
+            # it is worth adding again
+            col = cell % width
+            cost = frontier.costs[cell] + 1 if priority else 0
+            for child in (
+                cell - width if cell >= width else -1,
+                cell + width if cell + width < size else -1,
+                cell - 1 if col > 0 else -1,
+                cell + 1 if col < width - 1 else -1,
+            ):
+                if child == -1 or cells[child] or explored[child]:
+                    continue
+                if priority or not frontier.contains_state(child):
+                    if frontier.add(child, cost):
+                        parents[child] = cell
+
+
+    def trace(self, parents, start, goal):
+        """Stores the solution found by following parent links from goal."""
+        actions = []
+        states = []
+        cell = goal
+        while cell != start:
+            parent = parents[cell]
+            if parent == cell - self.width:
+                actions.append("down")
+            elif parent == cell + self.width:
+                actions.append("up")
+            elif parent == cell - 1:
+                actions.append("right")
+            else:
+                actions.append("left")
+            states.append(divmod(cell, self.width))
+            cell = parent
+        actions.reverse()
+        states.reverse()
+        self.solution = (actions, states)
+
+
+    def output_image(self, filename, show_solution=True, show_explored=False,
+                     tile_size=None):
+        """
+        Draws the maze to an image file, or to tiles of at most
+        `tile_size` cells a side if it is larger than that.
+        """
+        import numpy as np
+        import render
         cell_size = 50
         cell_border = 2
 
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
-
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
-
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
-
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
-
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
-
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
-
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
-
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
-
-        img.save(filename)
-
-
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
-
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
+        # Palette indices, painted from lowest to highest precedence
+        palette = [
+            (237, 240, 252),  # Empty cell
+            (212, 97, 85),    # Explored
+            (220, 235, 113),  # Solution
+            (0, 171, 28),     # Goal
+            (255, 0, 0),      # Start
+            (40, 40, 40),     # Walls
+        ]
+        grid = np.zeros((self.height, self.width), dtype=np.uint8)
+        if self.solution is not None:
+            if show_explored:
+                explored = np.frombuffer(self.explored.bitmap, dtype=np.uint8)
+                grid[explored.reshape(grid.shape) == 1] = 1
+            if show_solution and self.solution[1]:
+                rows, cols = zip(*self.solution[1])
+                grid[list(rows), list(cols)] = 2
+        grid[self.goal] = 3
+        grid[self.start] = 4
+        walls = np.frombuffer(self.cells, dtype=np.uint8)
+        grid[walls.reshape(grid.shape) == 1] = 5
+
+        return render.save(filename, grid, palette, cell_size, cell_border,
+                           tile_size=tile_size)
+
+
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python maze.py maze.txt [dfs|bfs|greedy|astar]")
+    strategy = sys.argv[2] if len(sys.argv) == 3 else "dfs"
+
+    m = Maze(sys.argv[1])
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve(strategy)
+    print("States Explored:", m.num_explored)
+    print("Solution:")
+    m.print()
+    m.output_image("maze.png", show_explored=True)
+
+
+if __name__ == "__main__":
+    main()
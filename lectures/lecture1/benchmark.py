@@ -0,0 +1,162 @@
+"""
+Benchmark of the model checking engines in logic.py
+
+Usage: python benchmark.py [engine ...]
+
+Asks every engine whether the mastermind (16 symbols) and clue
+(9 symbols) knowledge bases entail each of their symbols and its
+negation, checks that the answers agree, and prints the time taken,
+along with the time to answer the same queries with a KnowledgeBase.
+Then checks that the engines agree on random knowledge bases, and times
+the dpll engine on generated mastermind puzzles of up to 400 symbols.
+"""
+
+import random
+import sys
+import time
+
+from logic import *
+
+import clue
+import mastermind
+
+
+def benchmark(name, knowledge, symbols, engines):
+    """Times every engine on one knowledge base and checks the answers."""
+    queries = symbols + [Not(symbol) for symbol in symbols]
+    print(f"{name}: {len(knowledge.symbols())} symbols, "
+          f"{len(queries)} queries")
+
+    answers = {}
+    times = {}
+    for engine in engines:
+        start = time.perf_counter()
+        answers[engine] = [
+            model_check(knowledge, query, engine) for query in queries
+        ]
+        times[engine] = time.perf_counter() - start
+
+    for engine in engines:
+        speedup = times[engines[0]] / times[engine]
+        print(f"{engine:>11}: {times[engine]:8.3f} s, "
+              f"{speedup:6.1f}x {engines[0]}")
+        if answers[engine] != answers[engines[0]]:
+            raise Exception(f"{engine} disagrees with {engines[0]}")
+
+
+def incremental(name, knowledge, symbols):
+    """
+    Times rebuilding a knowledge base as a KnowledgeBase and answering
+    every query about its symbols from its models.
+    """
+    start = time.perf_counter()
+    kb = KnowledgeBase(*knowledge.conjuncts)
+    entailed = entailed_symbols(kb, symbols)
+    possible = [symbol for symbol in symbols if not kb.entails(Not(symbol))]
+    elapsed = time.perf_counter() - start
+    if entailed != [symbol for symbol in symbols
+                    if model_check(knowledge, symbol)]:
+        raise Exception(f"KnowledgeBase disagrees with model_check on {name}")
+    print(f"{'incremental':>11}: {elapsed:8.3f} s, {len(entailed)} entailed, "
+          f"{len(possible)} possible")
+
+
+def random_sentence(rng, symbols, depth):
+    """Returns a random sentence over symbols, nested up to depth deep."""
+    if depth == 0 or rng.random() < 0.2:
+        return rng.choice(symbols)
+    kind = rng.choice([Not, And, Or, Implication, Biconditional])
+    if kind == Not:
+        return Not(random_sentence(rng, symbols, depth - 1))
+    if kind in [And, Or]:
+        return kind(*[
+            random_sentence(rng, symbols, depth - 1)
+            for _ in range(rng.randint(1, 3))
+        ])
+    return kind(random_sentence(rng, symbols, depth - 1),
+                random_sentence(rng, symbols, depth - 1))
+
+
+def agreement(engines, trials=500, seed=0):
+    """Checks that the engines agree on random entailment questions."""
+    rng = random.Random(seed)
+    entailed = 0
+    for _ in range(trials):
+        symbols = [Symbol(f"s{i}") for i in range(rng.randint(1, 8))]
+        knowledge = And(*[
+            random_sentence(rng, symbols, 3)
+            for _ in range(rng.randint(1, 5))
+        ])
+        query = random_sentence(rng, symbols, 2)
+        answers = [model_check(knowledge, query, engine) for engine in engines]
+        if len(set(answers)) != 1:
+            raise Exception(f"engines disagree on {knowledge} |= {query}")
+        entailed += answers[0]
+    print(f"random: {len(engines)} engines agree on {trials} questions "
+          f"({entailed} entailed)")
+
+
+def puzzle(size, seed=0):
+    """
+    Returns (knowledge, solution) for mastermind with `size` colors and
+    positions, where a hidden order of the colors is given away by
+    ruling out all but the right position for every color but two, and
+    placing one of those two.
+    """
+    rng = random.Random(seed)
+    order = list(range(size))
+    rng.shuffle(order)
+
+    def symbol(color, position):
+        return Symbol(f"c{color}p{position}")
+
+    knowledge = And()
+    for color in range(size):
+        knowledge.add(Or(*[symbol(color, i) for i in range(size)]))
+        for i in range(size):
+            for j in range(size):
+                if i != j:
+                    knowledge.add(Implication(
+                        symbol(color, i), Not(symbol(color, j))
+                    ))
+                    knowledge.add(Implication(
+                        symbol(i, color), Not(symbol(j, color))
+                    ))
+    for position, color in enumerate(order[2:], 2):
+        for i in range(size):
+            if i != position:
+                knowledge.add(Not(symbol(color, i)))
+    knowledge.add(symbol(order[0], 0))
+    solution = [symbol(color, i) for i, color in enumerate(order)]
+    return knowledge, solution
+
+
+def scaling(sizes):
+    """Times the dpll engine on ever larger mastermind puzzles."""
+    for size in sizes:
+        knowledge, solution = puzzle(size)
+        start = time.perf_counter()
+        for symbol in solution:
+            if not model_check(knowledge, symbol, "dpll"):
+                raise Exception(f"dpll missed {symbol}")
+        elapsed = time.perf_counter() - start
+        print(f"{size * size:>5} symbols: {len(solution)} queries "
+              f"in {elapsed:.3f} s")
+
+
+def main():
+    engines = sys.argv[1:] or ENGINES
+    for engine in engines:
+        if engine not in ENGINES:
+            sys.exit(f"Engine must be one of {', '.join(ENGINES)}")
+    benchmark("clue", clue.knowledge, clue.symbols, engines)
+    incremental("clue", clue.knowledge, clue.symbols)
+    benchmark("mastermind", mastermind.knowledge, mastermind.symbols, engines)
+    incremental("mastermind", mastermind.knowledge, mastermind.symbols)
+    agreement(engines)
+    if "dpll" in engines:
+        scaling([4, 8, 12, 16, 20])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,57 @@
 import itertools
+import multiprocessing
+import os
+import weakref
+
+import sat
 
 
 class Sentence():
+    """
+    Sentences other than And are built once and not changed, so
+    structurally equal ones that contain no And share a single node.
+    Only shared nodes cache their hash and, once asked for it, their set
+    of symbols, since an And inside any other node can still be added to.
+    Fields cannot be assigned once a node is built, and operands are kept
+    in tuples, so a shared node cannot be changed under its other users.
+    """
+
+    __slots__ = ("_hash", "_symbols", "_interned", "__weakref__")
+
+    # Shared nodes by class and operands, while any of them are in use
+    interned = weakref.WeakValueDictionary()
+
+    @classmethod
+    def build(cls, operands, intern, **fields):
+        """
+        Returns the sentence of this class with the given operands,
+        setting `fields` on a new node. If `intern` is True, an equal node
+        is reused if there is one; callers only intern nodes whose
+        operands are all shared too.
+        """
+        if intern:
+            key = (cls, operands)
+            sentence = Sentence.interned.get(key)
+            if sentence is not None:
+                return sentence
+
+        sentence = object.__new__(cls)
+        for name, value in fields.items():
+            object.__setattr__(sentence, name, value)
+        object.__setattr__(sentence, "_hash", None)
+        object.__setattr__(sentence, "_symbols", None)
+        object.__setattr__(sentence, "_interned", intern)
+        if intern:
+            Sentence.interned[key] = sentence
+        return sentence
+
+    def __setattr__(self, name, value):
+        # Only the caches are filled in after build
+        if name not in ("_hash", "_symbols"):
+            raise AttributeError(
+                f"cannot set {name} of a built {type(self).__name__}"
+            )
+        object.__setattr__(self, name, value)
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
@@ -13,7 +63,54 @@ class Sentence():
 
     def symbols(self):
         """Returns a set of all symbols in the logical sentence."""
-        return set()
+        if self._symbols is not None:
+            return set(self._symbols)
+        symbols = set()
+        self.add_symbols(symbols)
+        if self._interned:
+            self._symbols = frozenset(symbols)
+        return symbols
+
+    def add_symbols(self, symbols):
+        """Adds all symbols in the logical sentence to a set."""
+        if self._symbols is not None:
+            symbols.update(self._symbols)
+        else:
+            for operand in self.operands():
+                operand.add_symbols(symbols)
+
+    def operands(self):
+        """Returns the sentences the logical sentence is made of."""
+        return ()
+
+    def __reduce__(self):
+        return (type(self), tuple(self.operands()))
+
+    def expression(self, slots, operands):
+        """
+        Returns a Python expression that evaluates the sentence in a model
+        m given as a sequence of truth values, where slots maps each
+        symbol name to its index in m, and operands are the expressions
+        of the sentence's operands.
+        """
+        raise Exception("nothing to evaluate")
+
+    def bitwise(self, slots, operands):
+        """
+        Returns a Python expression that evaluates the sentence in a block
+        of models at once: bit k of the result is its truth value in model
+        k, given the integer c[slots[name]] of each symbol's truth values,
+        full, the integer with a bit set for every model, and the
+        expressions of the sentence's operands.
+        """
+        raise Exception("nothing to evaluate")
+
+    def literal(self, cnf):
+        """
+        Returns a literal of a sat.CNF that is true exactly when the
+        sentence is, adding the clauses that define it to the CNF.
+        """
+        raise Exception("nothing to evaluate")
 
     @classmethod
     def validate(cls, sentence):
@@ -44,14 +141,24 @@ class Sentence():
 
 class Symbol(Sentence):
 
-    def __init__(self, name):
-        self.name = name
+    __slots__ = ("name",)
+
+    def __new__(cls, name):
+        return cls.build((name,), True, name=name)
+
+    def __reduce__(self):
+        return (type(self), (self.name,))
+
+    def add_symbols(self, symbols):
+        symbols.add(self.name)
 
     def __eq__(self, other):
         return isinstance(other, Symbol) and self.name == other.name
 
     def __hash__(self):
-        return hash(("symbol", self.name))
+        if self._hash is None:
+            self._hash = hash(("symbol", self.name))
+        return self._hash
 
     def __repr__(self):
         return self.name
@@ -65,20 +172,42 @@ class Symbol(Sentence):
     def formula(self):
         return self.name
 
-    def symbols(self):
-        return {self.name}
+    def expression(self, slots, operands):
+        try:
+            return f"m[{slots[self.name]}]"
+        except KeyError:
+            raise Exception(f"variable {self.name} not in model")
+
+    def bitwise(self, slots, operands):
+        try:
+            return f"c[{slots[self.name]}]"
+        except KeyError:
+            raise Exception(f"variable {self.name} not in model")
+
+    def literal(self, cnf):
+        return cnf.variable(self.name)
 
 
 class Not(Sentence):
-    def __init__(self, operand):
+
+    __slots__ = ("operand",)
+
+    def __new__(cls, operand):
         Sentence.validate(operand)
-        self.operand = operand
+        return cls.build((operand,), operand._interned, operand=operand)
+
+    def operands(self):
+        return (self.operand,)
 
     def __eq__(self, other):
-        return isinstance(other, Not) and self.operand == other.operand
+        return self is other or (
+            isinstance(other, Not) and self.operand == other.operand
+        )
 
     def __hash__(self):
-        return hash(("not", hash(self.operand)))
+        if self._hash is None or not self._interned:
+            self._hash = hash(("not", hash(self.operand)))
+        return self._hash
 
     def __repr__(self):
         return f"Not({self.operand})"
@@ -89,23 +218,41 @@ class Not(Sentence):
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
-    def symbols(self):
-        return self.operand.symbols()
+    def expression(self, slots, operands):
+        return f"(not {operands[0]})"
+
+    def bitwise(self, slots, operands):
+        return f"(full ^ {operands[0]})"
+
+    def literal(self, cnf):
+        return -self.operand.literal(cnf)
 
 
 class And(Sentence):
-    def __init__(self, *conjuncts):
+
+    __slots__ = ("conjuncts",)
+
+    def __new__(cls, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
-        self.conjuncts = list(conjuncts)
+
+        # Conjunctions can be added to, so are never shared
+        return cls.build(conjuncts, False, conjuncts=list(conjuncts))
+
+    def operands(self):
+        return self.conjuncts
 
     def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
+        return self is other or (
+            isinstance(other, And) and self.conjuncts == other.conjuncts
+        )
 
     def __hash__(self):
-        return hash(
-            ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
-        )
+        if self._hash is None or not self._interned:
+            self._hash = hash(
+                ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
+            )
+        return self._hash
 
     def __repr__(self):
         conjunctions = ", ".join(
@@ -126,23 +273,49 @@ class And(Sentence):
         return " ∧ ".join([Sentence.parenthesize(conjunct.formula())
                            for conjunct in self.conjuncts])
 
-    def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+    def expression(self, slots, operands):
+        if not operands:
+            return "True"
+        return "(" + " and ".join(operands) + ")"
+
+    def bitwise(self, slots, operands):
+        if not operands:
+            return "full"
+        return "(" + " & ".join(operands) + ")"
+
+    def literal(self, cnf):
+        return cnf.conjunction(
+            [conjunct.literal(cnf) for conjunct in self.conjuncts]
+        )
 
 
 class Or(Sentence):
-    def __init__(self, *disjuncts):
+
+    __slots__ = ("disjuncts",)
+
+    def __new__(cls, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
-        self.disjuncts = list(disjuncts)
+        return cls.build(
+            disjuncts,
+            all(disjunct._interned for disjunct in disjuncts),
+            disjuncts=disjuncts
+        )
+
+    def operands(self):
+        return self.disjuncts
 
     def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
+        return self is other or (
+            isinstance(other, Or) and self.disjuncts == other.disjuncts
+        )
 
     def __hash__(self):
-        return hash(
-            ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
-        )
+        if self._hash is None or not self._interned:
+            self._hash = hash(
+                ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
+            )
+        return self._hash
 
     def __repr__(self):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
@@ -157,24 +330,50 @@ class Or(Sentence):
         return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
                             for disjunct in self.disjuncts])
 
-    def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+    def expression(self, slots, operands):
+        if not operands:
+            return "False"
+        return "(" + " or ".join(operands) + ")"
+
+    def bitwise(self, slots, operands):
+        if not operands:
+            return "0"
+        return "(" + " | ".join(operands) + ")"
+
+    def literal(self, cnf):
+        return cnf.disjunction(
+            [disjunct.literal(cnf) for disjunct in self.disjuncts]
+        )
 
 
 class Implication(Sentence):
-    def __init__(self, antecedent, consequent):
+
+    __slots__ = ("antecedent", "consequent")
+
+    def __new__(cls, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
-        self.antecedent = antecedent
-        self.consequent = consequent
+        return cls.build(
+            (antecedent, consequent),
+            antecedent._interned and consequent._interned,
+            antecedent=antecedent,
+            consequent=consequent
+        )
+
+    def operands(self):
+        return (self.antecedent, self.consequent)
 
     def __eq__(self, other):
-        return (isinstance(other, Implication)
-                and self.antecedent == other.antecedent
-                and self.consequent == other.consequent)
+        return self is other or (isinstance(other, Implication)
+                                 and self.antecedent == other.antecedent
+                                 and self.consequent == other.consequent)
 
     def __hash__(self):
-        return hash(("implies", hash(self.antecedent), hash(self.consequent)))
+        if self._hash is None or not self._interned:
+            self._hash = hash(
+                ("implies", hash(self.antecedent), hash(self.consequent))
+            )
+        return self._hash
 
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
@@ -188,24 +387,48 @@ class Implication(Sentence):
         consequent = Sentence.parenthesize(self.consequent.formula())
         return f"{antecedent} => {consequent}"
 
-    def symbols(self):
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
+    def expression(self, slots, operands):
+        antecedent, consequent = operands
+        return f"(not {antecedent} or {consequent})"
+
+    def bitwise(self, slots, operands):
+        antecedent, consequent = operands
+        return f"((full ^ {antecedent}) | {consequent})"
+
+    def literal(self, cnf):
+        return cnf.disjunction(
+            [-self.antecedent.literal(cnf), self.consequent.literal(cnf)]
+        )
 
 
 class Biconditional(Sentence):
-    def __init__(self, left, right):
+
+    __slots__ = ("left", "right")
+
+    def __new__(cls, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
-        self.left = left
-        self.right = right
+        return cls.build(
+            (left, right),
+            left._interned and right._interned,
+            left=left,
+            right=right
+        )
+
+    def operands(self):
+        return (self.left, self.right)
 
     def __eq__(self, other):
-        return (isinstance(other, Biconditional)
-                and self.left == other.left
-                and self.right == other.right)
+        return self is other or (isinstance(other, Biconditional)
+                                 and self.left == other.left
+                                 and self.right == other.right)
 
     def __hash__(self):
-        return hash(("biconditional", hash(self.left), hash(self.right)))
+        if self._hash is None or not self._interned:
+            self._hash = hash(
+                ("biconditional", hash(self.left), hash(self.right))
+            )
+        return self._hash
 
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
@@ -221,11 +444,379 @@ class Biconditional(Sentence):
         right = Sentence.parenthesize(str(self.right))
         return f"{left} <=> {right}"
 
-    def symbols(self):
-        return set.union(self.left.symbols(), self.right.symbols())
+    def expression(self, slots, operands):
+        left, right = operands
+        return f"({left} == {right})"
+
+    def bitwise(self, slots, operands):
+        left, right = operands
+        return f"(full ^ {left} ^ {right})"
 
+    def literal(self, cnf):
+        return cnf.equivalence(self.left.literal(cnf), self.right.literal(cnf))
 
-def model_check(knowledge, query):
+
+class KnowledgeBase(And):
+    """
+    A conjunction that keeps track of the models it is true in as
+    conjuncts are added, so that entailment is answered without checking
+    every model from scratch.
+
+    Models are kept one bit each in an integer, like a block of the
+    bitwise engine, so a knowledge base suits up to about 25 symbols.
+    """
+
+    __slots__ = ("slots", "columns", "full", "models")
+
+    def __setattr__(self, name, value):
+        # The models kept track of change as conjuncts are added
+        if name in KnowledgeBase.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            super().__setattr__(name, value)
+
+    def __new__(cls, *conjuncts):
+        knowledge = super().__new__(cls)
+
+        # Slot and truth value integer of each symbol, the integer with
+        # a bit for every model, and the models the conjuncts are true in
+        knowledge.slots = {}
+        knowledge.columns = []
+        knowledge.full = 1
+        knowledge.models = 1
+        for conjunct in conjuncts:
+            knowledge.add(conjunct)
+        return knowledge
+
+    def add(self, conjunct):
+        super().add(conjunct)
+        self.slots, self.columns, self.full, self.models = self.extended(
+            conjunct.symbols()
+        )
+        self.models &= compile_bitwise(conjunct, self.slots)(
+            self.columns, self.full
+        )
+
+    def extended(self, symbols):
+        """
+        Returns (slots, columns, full, models) with the symbols not yet in
+        the knowledge base added, each free to take either value.
+        """
+        slots = dict(self.slots)
+        columns, full, models = self.columns, self.full, self.models
+        for symbol in sorted(symbols - slots.keys()):
+
+            # The new symbol is false in the old models, true in a copy
+            size = full.bit_length()
+            columns = [bits | bits << size for bits in columns]
+            columns.append(full << size)
+            models |= models << size
+            full |= full << size
+            slots[symbol] = len(slots)
+        return slots, columns, full, models
+
+    def entails(self, query):
+        """Checks if the knowledge base entails query."""
+        slots, columns, full, models = self.extended(query.symbols())
+        return not models & ~compile_bitwise(query, slots)(columns, full)
+
+
+def entailed_symbols(knowledge, symbols):
+    """
+    Returns the list of symbols that knowledge base entails, finding the
+    models of knowledge base once for all of them.
+    """
+    if not isinstance(knowledge, KnowledgeBase):
+        knowledge = KnowledgeBase(knowledge)
+    return [symbol for symbol in symbols if knowledge.entails(symbol)]
+
+
+ENGINES = ["enumerate", "compiled", "bitwise", "parallel", "dpll"]
+
+# The bitwise engine checks blocks of 2 ** BLOCK_SYMBOLS models at once
+BLOCK_SYMBOLS = 20
+
+# Compiled expressions nest at most this many sentences deep, and join
+# at most this many operands, before going into variables
+MAX_NESTING = 50
+MAX_OPERANDS = 100
+
+# Partitions of the blocks per process in the parallel engine
+PARTITIONS_PER_PROCESS = 4
+
+# Knowledge base and query of a parallel check, in worker processes
+partition_knowledge = None
+partition_query = None
+
+
+def compile_code(sentence, slots, method, arguments):
+    """
+    Returns a Python function of `arguments` that evaluates the sentence,
+    from the expression each node writes with `method`, "expression" or
+    "bitwise", given the expressions of its operands.
+
+    Expressions are nested into one another, except that one nesting
+    more than MAX_NESTING nodes deep, or joining more than MAX_OPERANDS
+    operands, is computed into a variable of its own first, so that deep
+    or long sentences compile too.
+    """
+    lines = []
+
+    def variable(result):
+        """Adds a line computing an expression, and returns its variable."""
+        lines.append(f"    v{len(lines)} = {result[0]}\n")
+        return f"v{len(lines) - 1}", 0
+
+    def write(node, operands):
+        """Returns (expression, depth) of a node from its operands'."""
+        expression = getattr(node, method)(
+            slots, [operand for operand, _ in operands]
+        )
+        return expression, 1 + max([depth for _, depth in operands], default=0)
+
+    def code(node):
+        """Returns (expression, depth) of a node, adding any lines it needs."""
+        operands = [code(operand) for operand in node.operands()]
+
+        # Only And and Or take more than two operands, and they can be
+        # grouped in any way
+        while len(operands) > MAX_OPERANDS:
+            operands = [
+                variable(write(node, operands[i:i + MAX_OPERANDS]))
+                for i in range(0, len(operands), MAX_OPERANDS)
+            ]
+        result = write(node, operands)
+        if result[1] > MAX_NESTING:
+            return variable(result)
+        return result
+
+    result = code(sentence)[0]
+    namespace = {}
+    exec(f"def f({arguments}):\n{''.join(lines)}    return {result}\n",
+         namespace)
+    return namespace["f"]
+
+
+def compile_sentence(sentence, slots):
+    """
+    Returns a function of a model, given as a sequence of truth values
+    indexed by slots, that evaluates the sentence in that model.
+    """
+    return compile_code(sentence, slots, "expression", "m")
+
+
+def compile_bitwise(sentence, slots):
+    """
+    Returns a function of symbol truth value integers c and the full
+    block mask that evaluates the sentence in every model of a block.
+    """
+    return compile_code(sentence, slots, "bitwise", "c, full")
+
+
+def column(slot, size):
+    """
+    Returns the integer whose bit k is the value of the symbol in `slot`
+    in model k of a block of 2 ** size models: blocks of 2 ** slot false
+    models alternate with blocks of as many true ones.
+    """
+    run = 1 << slot
+    bits = ((1 << run) - 1) << run
+    period = 2 * run
+    while period < 1 << size:
+        bits |= bits << period
+        period *= 2
+    return bits
+
+
+def model_check(knowledge, query, engine="bitwise", processes=None):
+    """
+    Checks if knowledge base entails query.
+
+    The "enumerate" engine evaluates the sentences recursively in every
+    model. The "compiled" engine compiles them into Python functions of
+    a tuple of truth values first, which is much faster. The "bitwise"
+    engine evaluates them with bitwise operations on integers holding
+    one bit per model, for a whole block of models at a time. The
+    "parallel" engine splits those blocks between `processes` processes
+    (by default, one per CPU).
+
+    The "dpll" engine does not enumerate models at all: it converts
+    knowledge and the negated query to CNF and shows with a SAT solver
+    that no model satisfies both. It is the only one that scales past
+    about 30 symbols.
+    """
+    if engine == "enumerate":
+        return enumerate_check(knowledge, query)
+    if engine == "compiled":
+        return compiled_check(knowledge, query)
+    if engine == "bitwise":
+        return bitwise_check(knowledge, query)
+    if engine == "parallel":
+        return parallel_check(knowledge, query, processes)
+    if engine == "dpll":
+        return dpll_check(knowledge, query)
+    raise ValueError(f"unknown engine {engine}")
+
+
+def dpll_check(knowledge, query):
+    """
+    Checks if knowledge base entails query, which it does exactly when
+    knowledge base and not query are unsatisfiable.
+    """
+    cnf = sat.CNF()
+
+    # Each conjunct of the knowledge base must be true
+    conjuncts = knowledge.conjuncts if isinstance(knowledge, And) else [knowledge]
+    for conjunct in conjuncts:
+        cnf.add([conjunct.literal(cnf)])
+    cnf.add([-query.literal(cnf)])
+    return sat.solve(cnf) is None
+
+
+def parallel_check(knowledge, query, processes=None):
+    """
+    Checks if knowledge base entails query with the bitwise engine, in a
+    pool of processes. Fixing the values of the last few symbols splits
+    the blocks of models into partitions that are checked in parallel,
+    and the check stops as soon as one finds a counter-model.
+
+    Checks of a single block are quicker than starting the pool, so they
+    run in this process.
+    """
+    if processes is None:
+        processes = os.cpu_count()
+    symbols = len(set.union(knowledge.symbols(), query.symbols()))
+    fixed = min(
+        max(0, symbols - BLOCK_SYMBOLS),
+        (PARTITIONS_PER_PROCESS * processes - 1).bit_length()
+    )
+    if fixed == 0:
+        return bitwise_check(knowledge, query)
+
+    partitions = [(part, 1 << fixed) for part in range(1 << fixed)]
+    # Forked workers share the pages of the parent, but not every
+    # platform can fork; elsewhere the sentences are pickled to them
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+    with context.Pool(processes, initializer=start_partition,
+                      initargs=(knowledge, query)) as pool:
+        for entailed in pool.imap_unordered(check_partition, partitions):
+            if not entailed:
+                return False
+    return True
+
+
+def start_partition(knowledge, query):
+    """Sets the knowledge base and query to check in a worker process."""
+    global partition_knowledge, partition_query
+    partition_knowledge = knowledge
+    partition_query = query
+
+
+def check_partition(partition):
+    """Checks one (part, parts) partition of the blocks of models."""
+    part, parts = partition
+    return bitwise_check(partition_knowledge, partition_query, part, parts)
+
+
+def bitwise_check(knowledge, query, part=0, parts=1):
+    """
+    Checks if knowledge base entails query, a block of models at a time.
+
+    Only every `parts`th block starting from block `part` is checked, so
+    a power of two `parts` splits the models into partitions by the
+    values of the last symbols.
+    """
+
+    # Give each symbol in knowledge and query a slot in the model
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    slots = {symbol: slot for slot, symbol in enumerate(symbols)}
+    knowledge = compile_bitwise(knowledge, slots)
+    query = compile_bitwise(query, slots)
+
+    # The first symbols vary within a block, the others between blocks
+    size = min(len(symbols), BLOCK_SYMBOLS)
+    full = (1 << (1 << size)) - 1
+    columns = [column(slot, size) for slot in range(size)]
+    for block in range(part, 1 << (len(symbols) - size), parts):
+        c = columns + [
+            full if block >> slot & 1 else 0
+            for slot in range(len(symbols) - size)
+        ]
+
+        # Query must be true in every model where knowledge base is true
+        if knowledge(c, full) & ~query(c, full):
+            return False
+    return True
+
+
+def batch_model_check(problems):
+    """
+    Checks many entailments at once. Takes a list of (knowledge,
+    queries) pairs and returns, for each pair, a list of whether the
+    knowledge base entails each of its queries.
+
+    All the pairs share one table of symbols, whose models are
+    enumerated once, a block at a time as in the bitwise engine. Every
+    knowledge base and query is evaluated on a whole block with bitwise
+    operations, and equal sentences are compiled and evaluated once.
+    """
+    symbols = set()
+    for knowledge, queries in problems:
+        symbols.update(knowledge.symbols())
+        for query in queries:
+            symbols.update(query.symbols())
+    symbols = sorted(symbols)
+    slots = {symbol: slot for slot, symbol in enumerate(symbols)}
+
+    functions = {}
+    for knowledge, queries in problems:
+        for sentence in [knowledge] + list(queries):
+            if sentence not in functions:
+                functions[sentence] = compile_bitwise(sentence, slots)
+
+    # Every query is entailed until a counter-model turns up
+    results = [[True] * len(queries) for _, queries in problems]
+    size = min(len(symbols), BLOCK_SYMBOLS)
+    full = (1 << (1 << size)) - 1
+    columns = [column(slot, size) for slot in range(size)]
+    for block in range(1 << (len(symbols) - size)):
+        c = columns + [
+            full if block >> slot & 1 else 0
+            for slot in range(len(symbols) - size)
+        ]
+        values = {}
+        for (knowledge, queries), entailed in zip(problems, results):
+            for i, query in enumerate(queries):
+                if not entailed[i]:
+                    continue
+                for sentence in [knowledge, query]:
+                    if sentence not in values:
+                        values[sentence] = functions[sentence](c, full)
+                if values[knowledge] & ~values[query]:
+                    entailed[i] = False
+    return results
+
+
+def compiled_check(knowledge, query):
+    """Checks if knowledge base entails query, using compiled sentences."""
+
+    # Give each symbol in knowledge and query a slot in the model
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    slots = {symbol: slot for slot, symbol in enumerate(symbols)}
+    knowledge = compile_sentence(knowledge, slots)
+    query = compile_sentence(query, slots)
+
+    # Query must be true in every model where knowledge base is true
+    for model in itertools.product((True, False), repeat=len(symbols)):
+        if knowledge(model) and not query(model):
+            return False
+    return True
+
+
+def enumerate_check(knowledge, query):
     """Checks if knowledge base entails query."""
 
     def check_all(knowledge, query, symbols, model):
@@ -6,7 +6,7 @@ for i in range(4):
     for color in colors:
         symbols.append(Symbol(f"{color}{i}"))
 
-knowledge = And()
+knowledge = KnowledgeBase()
 
 # Each color has a position.
 for color in colors:
@@ -51,6 +51,11 @@ knowledge.add(And(
     Not(Symbol("yellow3"))
 ))
 
-for symbol in symbols:
-    if model_check(knowledge, symbol):
+
+def main():
+    for symbol in entailed_symbols(knowledge, symbols):
         print(symbol)
+
+
+if __name__ == "__main__":
+    main()
@@ -136,18 +136,23 @@ class Space():
     def output_image(self, filename):
         """Generates image with all houses and hospitals."""
         from PIL import Image, ImageDraw, ImageFont
+        import render
         cell_size = 100
         cell_border = 2
         cost_size = 40
         padding = 10
 
-        # Create a blank canvas
+        # Create a blank canvas with the grid of cells at the top
         img = Image.new(
             "RGBA",
             (self.width * cell_size,
              self.height * cell_size + cost_size + padding * 2),
-            "white"
+            "black"
         )
+        img.paste(render.render(
+            [[0] * self.width for _ in range(self.height)], ["black"],
+            cell_size, cell_border, background="white"
+        ))
         house = Image.open("assets/images/House.png").resize(
             (cell_size, cell_size)
         )
@@ -157,29 +162,15 @@ class Space():
         font = ImageFont.truetype("assets/fonts/OpenSans-Regular.ttf", 30)
         draw = ImageDraw.Draw(img)
 
-        for i in range(self.height):
-            for j in range(self.width):
-
-                # Draw cell
-                rect = [
-                    (j * cell_size + cell_border,
-                     i * cell_size + cell_border),
-                    ((j + 1) * cell_size - cell_border,
-                     (i + 1) * cell_size - cell_border)
-                ]
-                draw.rectangle(rect, fill="black")
-
-                if (i, j) in self.houses:
-                    img.paste(house, rect[0], house)
-                if (i, j) in self.hospitals:
-                    img.paste(hospital, rect[0], hospital)
+        # Only cells with a house or hospital need a sprite
+        for i, j in self.houses:
+            img.paste(house, render.corner(i, j, cell_size, cell_border), house)
+        for i, j in self.hospitals:
+            img.paste(
+                hospital, render.corner(i, j, cell_size, cell_border), hospital
+            )
 
         # Add cost
-        draw.rectangle(
-            (0, self.height * cell_size, self.width * cell_size,
-             self.height * cell_size + cost_size + padding * 2),
-            "black"
-        )
         draw.text(
             (padding, self.height * cell_size + padding),
             f"Cost: {self.get_cost(self.hospitals)}",
@@ -0,0 +1,97 @@
+"""
+Grid image rendering
+
+Draws grids of square cells, each filled with one palette color and
+framed by a border in the background color. The whole grid is colored
+and scaled up to cell size as NumPy arrays, so only sprites and text
+are drawn cell by cell. Grids too big for one image can be split into
+tiles.
+
+The same file is used by every program here that draws a grid.
+"""
+
+import os
+
+import numpy as np
+from PIL import Image, ImageColor
+
+
+def rgba(color):
+    """Returns the (r, g, b, a) tuple of a PIL color name or tuple."""
+    if isinstance(color, str):
+        return ImageColor.getcolor(color, "RGBA")
+    return tuple(color) + (255,) * (4 - len(color))
+
+
+def render(grid, palette, cell_size, cell_border=0, background="black"):
+    """
+    Returns an RGBA image of a 2D array of indices into `palette`, with
+    each cell drawn as a `cell_size` square whose outer `cell_border`
+    pixels (and one fewer on the bottom and right) are `background`.
+    """
+    grid = np.asarray(grid)
+    height, width = grid.shape
+    colors = np.array([rgba(color) for color in palette], dtype=np.uint8)
+
+    # One pixel per cell, then each repeated into a cell_size square
+    pixels = colors[grid]
+    pixels = pixels.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+
+    # Paint over the border rows and columns of every cell
+    if cell_border:
+        offsets = np.arange(cell_size)
+        border = (offsets < cell_border) | (offsets > cell_size - cell_border)
+        pixels[np.tile(border, height)] = rgba(background)
+        pixels[:, np.tile(border, width)] = rgba(background)
+
+    return Image.fromarray(pixels, "RGBA")
+
+
+def corner(i, j, cell_size, cell_border=0):
+    """Returns the pixel (x, y) of the top left of cell (i, j)'s interior."""
+    return (j * cell_size + cell_border, i * cell_size + cell_border)
+
+
+def save(filename, grid, palette, cell_size, cell_border=0,
+         background="black", overlay=None, tile_size=None):
+    """
+    Renders a grid and saves it to `filename`, returning the list of
+    files written.
+
+    If `overlay` is given, it is called as overlay(image, top, left,
+    bottom, right) to draw sprites or text on the image of the cells in
+    rows top to bottom - 1 and columns left to right - 1.
+
+    If `tile_size` is given, grids with more than `tile_size` rows or
+    columns are saved as tiles of at most that many cells a side, named
+    like maze_0_1.png for the tile in the first row and second column.
+    """
+    grid = np.asarray(grid)
+    height, width = grid.shape
+    if tile_size is None or (height <= tile_size and width <= tile_size):
+        tile_size = max(height, width, 1)
+        names = [filename]
+    else:
+        root, ext = os.path.splitext(filename)
+        names = [
+            f"{root}_{row}_{col}{ext}"
+            for row in range(-(-height // tile_size))
+            for col in range(-(-width // tile_size))
+        ]
+
+    names = iter(names)
+    written = []
+    for top in range(0, height, tile_size):
+        for left in range(0, width, tile_size):
+            bottom = min(top + tile_size, height)
+            right = min(left + tile_size, width)
+            image = render(
+                grid[top:bottom, left:right], palette,
+                cell_size, cell_border, background
+            )
+            if overlay is not None:
+                overlay(image, top, left, bottom, right)
+            name = next(names)
+            image.save(name)
+            written.append(name)
+    return written
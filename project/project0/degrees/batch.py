@@ -0,0 +1,119 @@
+import csv
+import json
+import multiprocessing
+import sys
+import time
+
+import degrees
+
+"""
+Answers many source,target queries against one loaded graph.
+
+Each input line is a CSV pair of person ids or names, for example
+
+    102,129
+    Kevin Bacon,Tom Cruise
+
+and each answer is written to stdout as one JSON object per line, in
+input order, with the path and the time the query took. Rows that are
+not a pair are answered with an error.
+"""
+
+
+def start_worker(directory):
+    """
+    Loads the data in a worker process, unless it was inherited from the
+    parent by forking.
+    """
+    if not degrees.people:
+        degrees.load_data(directory, indexed=True, snapshot=True)
+
+
+def resolve(value):
+    """
+    Returns the person id for an id or an unambiguous name, or None.
+    """
+    if value in degrees.people:
+        return value
+    person_ids = degrees.names.get(value.lower(), set())
+    if len(person_ids) == 1:
+        return next(iter(person_ids))
+    return None
+
+
+def answer(query):
+    """
+    Returns the JSON-ready answer to a (line, source, target) query.
+    """
+    line, source, target = query
+    if source is None:
+        return {"line": line, "error": "Expected source,target."}
+    start = time.perf_counter()
+    response = {"line": line, "source": source, "target": target}
+
+    source_id, target_id = resolve(source), resolve(target)
+    if source_id is None or target_id is None:
+        response["error"] = "Person not found."
+    else:
+        path = degrees.shortest_path(source_id, target_id, bidirectional=True)
+        if path is None:
+            response["degrees"] = None
+        else:
+            response["degrees"] = len(path)
+            response["path"] = [
+                {"movie_id": movie_id, "person_id": person_id}
+                for movie_id, person_id in path
+            ]
+
+    response["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return response
+
+
+def read_queries(f):
+    """
+    Yields (line, source, target) for every non-empty input line, with
+    source and target None for a line that is not a pair. This runs in
+    the pool's task thread, so it must not raise or exit; each line is
+    parsed on its own, so one malformed line does not end the run.
+    """
+    for line, text in enumerate(f, 1):
+        try:
+            row = next(csv.reader([text]), [])
+        except csv.Error:
+            yield line, None, None
+            continue
+        if not row:
+            continue
+        if len(row) != 2:
+            yield line, None, None
+            continue
+        yield line, row[0].strip(), row[1].strip()
+
+
+def main():
+    if len(sys.argv) not in [2, 3, 4]:
+        sys.exit("Usage: python batch.py directory [queries.csv|-] [workers]")
+    directory = sys.argv[1]
+    filename = sys.argv[2] if len(sys.argv) >= 3 else "-"
+    workers = int(sys.argv[3]) if len(sys.argv) == 4 else None
+
+    # Load once in the parent, so forked workers share the pages
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(directory, indexed=True, snapshot=True)
+    print("Data loaded.", file=sys.stderr)
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+
+    f = sys.stdin if filename == "-" else open(filename, encoding="utf-8")
+    with f, context.Pool(
+        workers, initializer=start_worker, initargs=(directory,)
+    ) as pool:
+        for response in pool.imap(answer, read_queries(f), chunksize=16):
+            print(json.dumps(response), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import random
+import sys
+import time
+
+import degrees
+from graph import CostarIndex
+from nameindex import NameIndex
+from util import Node, StackFrontier, QueueFrontier
+
+
+def benchmark_search(pairs):
+    """
+    Runs every (source, target) pair through the one-sided BFS and the
+    bidirectional search, both over the dictionaries and over the co-star
+    index, and prints people expanded and wall time for each.
+    """
+    start = time.perf_counter()
+    costar_index = CostarIndex(degrees.people, degrees.movies)
+    print(f"Index built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    modes = [
+        ("BFS", None, False),
+        ("Bidirectional", None, True),
+        ("Indexed BFS", costar_index, False),
+        ("Indexed bidir", costar_index, True),
+    ]
+    totals = {name: [0, 0.0] for name, _, _ in modes}
+    for source, target in pairs:
+        lengths = set()
+        for name, index, bidirectional in modes:
+            degrees.index = index
+            start = time.perf_counter()
+            path = degrees.shortest_path(source, target, bidirectional)
+            elapsed = time.perf_counter() - start
+            totals[name][0] += degrees.num_explored
+            totals[name][1] += elapsed
+            lengths.add(None if path is None else len(path))
+
+        # Every mode must agree on the number of degrees
+        if len(lengths) != 1:
+            sys.exit(f"Mismatch for {source} -> {target}: {lengths}")
+    degrees.index = None
+
+    print(f"{len(pairs)} queries")
+    for name, _, _ in modes:
+        expanded, elapsed = totals[name]
+        print(f"{name:>14}: {expanded:>10} people expanded, "
+              f"{elapsed * 1000:>10.1f} ms")
+
+
+def benchmark_frontier(sizes=(1000, 10000, 100000), operations=1000):
+    """
+    Times `remove` and `contains_state` on stack and queue frontiers of
+    growing size; the cost per operation should stay flat.
+    """
+    for frontier_class in (StackFrontier, QueueFrontier):
+        print(frontier_class.__name__)
+        for size in sizes:
+            frontier = frontier_class()
+            for state in range(size):
+                frontier.add(Node(state=state, parent=None, action=None))
+
+            # Look up states spread across the whole frontier
+            start = time.perf_counter()
+            for i in range(operations):
+                frontier.contains_state(i * size // operations)
+            contains = (time.perf_counter() - start) / operations
+
+            start = time.perf_counter()
+            for _ in range(operations):
+                frontier.remove()
+            remove = (time.perf_counter() - start) / operations
+
+            print(f"{size:>10} nodes: remove {remove * 1e9:>8.0f} ns, "
+                  f"contains_state {contains * 1e9:>8.0f} ns")
+
+
+def misspell(name):
+    """Returns a name with one random character deleted, swapped or changed."""
+    i = random.randrange(len(name))
+    edit = random.choice(["delete", "swap", "change"])
+    if edit == "delete":
+        return name[:i] + name[i + 1:]
+    if edit == "swap" and i + 1 < len(name):
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    return name[:i] + random.choice("abcdefghijklmnopqrstuvwxyz") + name[i + 1:]
+
+
+def benchmark_names(queries):
+    """
+    Builds the name index, then looks up misspelled versions of random
+    names and prints memory, lookup latency and how often the intended
+    person is among the candidates.
+    """
+    start = time.perf_counter()
+    name_index = NameIndex(degrees.names)
+    elapsed = time.perf_counter() - start
+    memory = sum(
+        len(numbers) * numbers.itemsize
+        for numbers in name_index.postings.values()
+    )
+    print(f"Index built in {elapsed * 1000:.1f} ms, "
+          f"postings {memory / 2 ** 20:.1f} MiB, "
+          f"{len(name_index.common)} common trigrams dropped")
+
+    hits = 0
+    latencies = []
+    person_ids = list(degrees.people)
+    for _ in range(queries):
+        person_id = random.choice(person_ids)
+        name = misspell(degrees.people[person_id]["name"])
+        start = time.perf_counter()
+        candidates = name_index.candidates(name)
+        latencies.append(time.perf_counter() - start)
+        hits += person_id in candidates
+
+    latencies.sort()
+    print(f"{queries} misspelled lookups: {hits / queries:.1%} found, "
+          f"median {latencies[len(latencies) // 2] * 1e6:.0f} us, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:.0f} us")
+
+
+def main():
+    if len(sys.argv) == 2 and sys.argv[1] == "frontier":
+        benchmark_frontier()
+        return
+    names = len(sys.argv) > 1 and sys.argv[1] == "names"
+    if names:
+        sys.argv.pop(1)
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python benchmark.py "
+                 "([names] directory [queries] | frontier)")
+    directory = sys.argv[1]
+    queries = int(sys.argv[2]) if len(sys.argv) == 3 else 100
+
+    print("Loading data...")
+    degrees.load_data(directory)
+    print("Data loaded.")
+
+    random.seed(0)
+    if names:
+        benchmark_names(queries)
+        return
+    person_ids = list(degrees.people)
+    pairs = [
+        (random.choice(person_ids), random.choice(person_ids))
+        for _ in range(queries)
+    ]
+    benchmark_search(pairs)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 import csv
+import os
 import sys
+from collections import OrderedDict
 
+from graph import CostarIndex
+from nameindex import NameIndex
+from snapshot import read_snapshot, read_trees, write_snapshot
 from util import Node, StackFrontier, QueueFrontier
 
 # Maps names to a set of corresponding person_ids
@@ -12,6 +17,24 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Number of people expanded by the most recent search
+num_explored = 0
+
+# Optional CostarIndex over people and movies, built by load_data
+index = None
+
+# NameIndex over names for misspelled input, built on the first miss
+name_index = None
+
+# Maps source person_ids to the ParentTree of their most recent
+# single-source searches, least recently used first
+trees = OrderedDict()
+TREE_CACHE_SIZE = 64
+
+# Maps source person_ids to ParentTrees precomputed offline, which are
+# never evicted
+precomputed_trees = {}
+
 """
 e.g
 names = {'fred astaire': {1}, 
@@ -31,12 +54,29 @@ movies = {
     }
 """
 
-def load_data(directory):
+def load_data(directory, indexed=False, snapshot=False):
     """
     Load data from CSV files into memory.
+
+    If `indexed` is True, also build the co-star index that searches and
+    `neighbors_for_person` use instead of walking the dictionaries.
+
+    If `snapshot` is True, load from the directory's snapshot file when it
+    is still up to date with the CSV files, and otherwise write one after
+    loading the CSV files. Snapshots always carry the co-star index.
     """
+    global index, names, people, movies
+
+    # Snapshot data replaces the dictionaries with mappings that build
+    # each entry when it is first looked up
+    if snapshot:
+        data = read_snapshot(directory)
+        if data is not None:
+            names, people, movies, index = data
+            return
+
     # Load people
-    with open(f"{directory}\\people.csv", encoding="utf-8") as f:
+    with open(os.path.join(directory, "people.csv"), encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
             people[row["id"]] = {
@@ -50,7 +90,7 @@ def load_data(directory):
                 names[row["name"].lower()].add(row["id"])
 
     # Load movies
-    with open(f"{directory}\\movies.csv", encoding="utf-8") as f:
+    with open(os.path.join(directory, "movies.csv"), encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
             movies[row["id"]] = {
@@ -60,7 +100,7 @@ def load_data(directory):
             }
 
     # Load stars
-    with open(f"{directory}\\stars.csv", encoding="utf-8") as f:
+    with open(os.path.join(directory, "stars.csv"), encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
             try:
@@ -69,6 +109,107 @@ def load_data(directory):
             except KeyError:
                 pass
 
+    if indexed or snapshot:
+        index = CostarIndex(people, movies)
+
+    # Failing to write a snapshot only costs speed on the next start
+    if snapshot:
+        try:
+            write_snapshot(directory, names, people, movies, index)
+        except OSError:
+            pass
+
+
+def ingest_delta(directory):
+    """
+    Applies the rows of delta CSV files in `directory` to the loaded data.
+
+    Any of people.csv, movies.csv and stars.csv may be missing. Rows for
+    people and movies that are already loaded, and credits that already
+    exist or refer to unknown people or movies, are skipped. The co-star
+    and name indexes are extended in place, and cached parent trees that
+    the new credits could change are dropped.
+
+    Returns a dictionary counting what was added, skipped and dropped.
+    """
+    counts = {
+        "people": 0, "movies": 0, "stars": 0, "skipped": 0, "trees": 0
+    }
+
+    def rows(filename):
+        """Yields the rows of a delta file, if there is one."""
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                yield from csv.DictReader(f)
+
+    # Add new people
+    for row in rows("people.csv"):
+        if row["id"] in people:
+            counts["skipped"] += 1
+            continue
+        people[row["id"]] = {
+            "name": row["name"],
+            "birth": row["birth"],
+            "movies": set()
+        }
+        name = row["name"].lower()
+        if name not in names:
+            names[name] = {row["id"]}
+            if name_index is not None:
+                name_index.add(name)
+        else:
+            names[name].add(row["id"])
+        if index is not None:
+            index.add_person(row["id"])
+        counts["people"] += 1
+
+    # Add new movies
+    for row in rows("movies.csv"):
+        if row["id"] in movies:
+            counts["skipped"] += 1
+            continue
+        movies[row["id"]] = {
+            "title": row["title"],
+            "year": row["year"],
+            "stars": set()
+        }
+        if index is not None:
+            index.add_movie(row["id"])
+        counts["movies"] += 1
+
+    # Add new credits, linking each person with the movie's other stars
+    touched = set()
+    for row in rows("stars.csv"):
+        person_id, movie_id = row["person_id"], row["movie_id"]
+        if (person_id not in people or movie_id not in movies
+                or movie_id in people[person_id]["movies"]):
+            counts["skipped"] += 1
+            continue
+        stars = movies[movie_id]["stars"]
+        people[person_id]["movies"].add(movie_id)
+        stars.add(person_id)
+        if index is not None:
+            for star in stars:
+                index.add_edge(movie_id, person_id, star)
+                if star != person_id:
+                    index.add_edge(movie_id, star, person_id)
+        touched.update(stars)
+        counts["stars"] += 1
+
+    # A tree can only change if it reaches one of the linked people
+    for cache in (trees, precomputed_trees):
+        for source in list(cache):
+            tree = cache[source]
+            for person_id in touched:
+                person = index.person_index[person_id]
+                if tree.distance(person) is not None:
+                    del cache[source]
+                    counts["trees"] += 1
+                    break
+
+    return counts
+
 
 def main():
     # sys.argv.append("large")
@@ -78,7 +219,8 @@ def main():
 
     # Load data from files into memory
     print("Loading data...")
-    load_data(directory)
+    load_data(directory, indexed=True, snapshot=True)
+    precomputed_trees.update(read_trees(directory))
     print("Data loaded.")
 
     source = person_id_for_name(input("Name: "))
@@ -103,17 +245,28 @@ def main():
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def shortest_path(source, target, bidirectional=False):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
     If no possible path, returns None.
+
+    If `bidirectional` is True, search from both ends at once instead
+    of running a single BFS from the source.
     """
+    if source in trees or source in precomputed_trees:
+        return tree_path(parent_tree(source), target)
+    if index is not None:
+        return indexed_shortest_path(source, target, bidirectional)
+    if bidirectional:
+        return bidirectional_shortest_path(source, target)
 
     """
     use BFS algorithm
     """
+    global num_explored
+    num_explored = 0
 
     # Initialize frontier to just the starting position
     frontier = QueueFrontier()
@@ -154,14 +307,175 @@ def shortest_path(source, target):
 
         # Mark node as explored
         searched.add(node.state)
+        num_explored += 1
 
         # Add neighbors to frontier
         for movie in people[node.state]['movies']:
             for star in movies[movie]['stars']:
                 frontier.add(Node(state=star, parent=node, action=Node))
-        
 
 
+def bidirectional_shortest_path(source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, searching outwards from
+    both people one full layer at a time until the two searches meet.
+
+    If no possible path, returns None.
+    """
+    global num_explored
+    num_explored = 0
+
+    if source == target:
+        return []
+
+    # Each side maps a person to (movie_id, person_id) one step closer
+    # to the side's origin, and keeps the distance to that origin
+    forward_parents = {source: None}
+    backward_parents = {target: None}
+    forward_distance = {source: 0}
+    backward_distance = {target: 0}
+    forward_layer = [source]
+    backward_layer = [target]
+
+    while forward_layer and backward_layer:
+
+        # Always grow the smaller side
+        if len(forward_layer) <= len(backward_layer):
+            layer, parents, distance = (
+                forward_layer, forward_parents, forward_distance
+            )
+            other_distance = backward_distance
+        else:
+            layer, parents, distance = (
+                backward_layer, backward_parents, backward_distance
+            )
+            other_distance = forward_distance
+
+        # Expand the whole layer, remembering the best meeting point
+        next_layer = []
+        meeting = None
+        best = None
+        for person_id in layer:
+            num_explored += 1
+            for movie_id in people[person_id]["movies"]:
+                for star in movies[movie_id]["stars"]:
+                    if star in parents:
+                        continue
+                    parents[star] = (movie_id, person_id)
+                    distance[star] = distance[person_id] + 1
+                    next_layer.append(star)
+                    if star in other_distance:
+                        total = distance[star] + other_distance[star]
+                        if best is None or total < best:
+                            meeting, best = star, total
+
+        if meeting is not None:
+            return join_paths(
+                forward_parents, backward_parents, source, target, meeting
+            )
+
+        if layer is forward_layer:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+
+    return None
+
+
+def indexed_shortest_path(source, target, bidirectional=False):
+    """
+    Runs `shortest_path` against the co-star index and translates the
+    result back to (movie_id, person_id) pairs.
+    """
+    global num_explored
+    path = index.shortest_path(
+        index.person_index[source], index.person_index[target], bidirectional
+    )
+    num_explored = index.num_explored
+    if path is None:
+        return None
+    return [
+        (index.movie_ids[movie], index.person_ids[person])
+        for movie, person in path
+    ]
+
+
+def parent_tree(source):
+    """
+    Returns the ParentTree of a BFS from the source over the whole graph,
+    reusing precomputed or recently used trees.
+    """
+    global index
+    if source in precomputed_trees:
+        return precomputed_trees[source]
+    if source in trees:
+        trees.move_to_end(source)
+        return trees[source]
+
+    if index is None:
+        index = CostarIndex(people, movies)
+    tree = index.parent_tree(index.person_index[source])
+    trees[source] = tree
+    if len(trees) > TREE_CACHE_SIZE:
+        trees.popitem(last=False)
+    return tree
+
+
+def single_source_distances(person_id):
+    """
+    Returns a dictionary mapping every person_id reachable from the given
+    person to their degrees of separation. Later paths from the same
+    person are answered from the stored parent tree.
+    """
+    tree = parent_tree(person_id)
+    return {
+        index.person_ids[person]: distance
+        for person, distance in enumerate(tree.distances)
+        if distance != -1
+    }
+
+
+def tree_path(tree, target):
+    """
+    Returns the (movie_id, person_id) path from the root of a ParentTree
+    to the target, or None if there is no path.
+    """
+    global num_explored
+    num_explored = 0
+    path = tree.path(index.person_index[target])
+    if path is None:
+        return None
+    return [
+        (index.movie_ids[movie], index.person_ids[person])
+        for movie, person in path
+    ]
+
+
+def join_paths(forward_parents, backward_parents, source, target, meeting):
+    """
+    Builds the (movie_id, person_id) path from source to target that
+    passes through `meeting`, using the parent maps of both searches.
+    """
+    path = []
+
+    # Walk back from the meeting point to the source
+    person_id = meeting
+    while person_id != source:
+        movie_id, parent = forward_parents[person_id]
+        path.append((movie_id, person_id))
+        person_id = parent
+    path.reverse()
+
+    # Walk forward from the meeting point to the target
+    person_id = meeting
+    while person_id != target:
+        movie_id, child = backward_parents[person_id]
+        path.append((movie_id, child))
+        person_id = child
+
+    return path
+
 
 def person_id_for_name(name):
     """
@@ -170,7 +484,7 @@ def person_id_for_name(name):
     """
     person_ids = list(names.get(name.lower(), set()))
     if len(person_ids) == 0:
-        return None
+        return suggest_person_id(name)
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
         for person_id in person_ids:
@@ -189,11 +503,39 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def suggest_person_id(name):
+    """
+    Offers the closest names in the name index for a name with no exact
+    match, and returns the chosen IMDB id or None.
+    """
+    global name_index
+    if name_index is None:
+        name_index = NameIndex(names)
+    person_ids = name_index.candidates(name)
+    if len(person_ids) == 0:
+        return None
+    print(f"No exact match for '{name}'. Did you mean:")
+    for person_id in person_ids:
+        person = people[person_id]
+        print(f"ID: {person_id}, Name: {person['name']}, "
+              f"Birth: {person['birth']}")
+    person_id = input("Intended Person ID: ")
+    if person_id in person_ids:
+        return person_id
+    return None
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
+    if index is not None:
+        return set(
+            (index.movie_ids[movie], index.person_ids[person])
+            for movie, person in index.costars(index.person_index[person_id])
+        )
+
     movie_ids = people[person_id]["movies"]
     neighbors = set()
     for movie_id in movie_ids:
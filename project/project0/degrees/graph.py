@@ -0,0 +1,266 @@
+from array import array
+from itertools import chain
+
+
+class CostarIndex():
+    """
+    Compact co-star graph in compressed sparse row form.
+
+    People and movies are numbered 0..n-1. The co-stars of person `p` are
+    `neighbors[offsets[p]:offsets[p + 1]]`, and `edge_movies` holds the
+    movie shared along each of those edges.
+
+    People, movies and edges ingested after the arrays were built are
+    numbered after the existing ones, and their edges are kept in the
+    `extra` dictionary of person -> [(movie, person), ...] instead.
+    """
+
+    # Size in bytes of every value in the index arrays
+    ITEMSIZE = array("i").itemsize
+
+    def __init__(self, people, movies):
+        """Builds the index from the `people` and `movies` dictionaries."""
+        self.person_ids = list(people)
+        self.person_index = {
+            person_id: i for i, person_id in enumerate(self.person_ids)
+        }
+        self.movie_ids = list(movies)
+        self.movie_index = {
+            movie_id: i for i, movie_id in enumerate(self.movie_ids)
+        }
+
+        self.offsets = array("i", [0])
+        self.neighbors = array("i")
+        self.edge_movies = array("i")
+        for person_id in self.person_ids:
+            for movie_id in people[person_id]["movies"]:
+
+                # Credits for movies missing from movies.csv lead nowhere
+                if movie_id not in self.movie_index:
+                    continue
+                movie = self.movie_index[movie_id]
+                for star in movies[movie_id]["stars"]:
+                    self.neighbors.append(self.person_index[star])
+                    self.edge_movies.append(movie)
+            self.offsets.append(len(self.neighbors))
+
+        self.extra = {}
+
+        # Number of people expanded by the most recent search
+        self.num_explored = 0
+
+    @classmethod
+    def from_arrays(cls, person_ids, movie_ids, offsets, neighbors,
+                    edge_movies, person_index=None, movie_index=None):
+        """
+        Builds an index around existing id lists and int arrays, such as
+        the memory-mapped ones of a snapshot, without copying them. The
+        mappings from ids back to numbers are built unless given.
+        """
+        index = cls.__new__(cls)
+        index.person_ids = person_ids
+        if person_index is None:
+            person_index = {
+                person_id: i for i, person_id in enumerate(person_ids)
+            }
+        index.person_index = person_index
+        index.movie_ids = movie_ids
+        if movie_index is None:
+            movie_index = {
+                movie_id: i for i, movie_id in enumerate(movie_ids)
+            }
+        index.movie_index = movie_index
+        index.offsets = offsets
+        index.neighbors = neighbors
+        index.edge_movies = edge_movies
+        index.extra = {}
+        index.num_explored = 0
+        return index
+
+    def __len__(self):
+        return len(self.person_ids)
+
+    def costars(self, person):
+        """Returns (movie, person) index pairs for a person index."""
+        if person + 1 < len(self.offsets):
+            start, end = self.offsets[person], self.offsets[person + 1]
+            pairs = zip(self.edge_movies[start:end], self.neighbors[start:end])
+        else:
+            pairs = ()
+        if person in self.extra:
+            return chain(pairs, self.extra[person])
+        return pairs
+
+    def add_person(self, person_id):
+        """Numbers a newly ingested person and returns their index."""
+        self.person_index[person_id] = len(self.person_ids)
+        self.person_ids.append(person_id)
+        return self.person_index[person_id]
+
+    def add_movie(self, movie_id):
+        """Numbers a newly ingested movie and returns its index."""
+        self.movie_index[movie_id] = len(self.movie_ids)
+        self.movie_ids.append(movie_id)
+        return self.movie_index[movie_id]
+
+    def add_edge(self, movie_id, person_id, costar_id):
+        """Records that a person starred with a co-star in a movie."""
+        self.extra.setdefault(self.person_index[person_id], []).append(
+            (self.movie_index[movie_id], self.person_index[costar_id])
+        )
+
+    def shortest_path(self, source, target, bidirectional=False):
+        """
+        Returns the shortest list of (movie, person) index pairs that
+        connect the source index to the target index, or None.
+
+        Searches keep their parent links in dictionaries of the people
+        they reach, so a short path costs little however big the index.
+        """
+        self.num_explored = 0
+        if source == target:
+            return []
+        if bidirectional:
+            return self.bidirectional_shortest_path(source, target)
+
+        # Plain BFS over index arrays, testing the goal as nodes are seen,
+        # with the (movie, person) each person was reached from
+        parents = {source: None}
+        layer = [source]
+        while layer:
+            next_layer = []
+            for person in layer:
+                self.num_explored += 1
+                for movie, star in self.costars(person):
+                    if star in parents:
+                        continue
+                    parents[star] = (movie, person)
+                    if star == target:
+                        return self.walk(parents, source, star)
+                    next_layer.append(star)
+            layer = next_layer
+        return None
+
+    def bidirectional_shortest_path(self, source, target):
+        """
+        Same as `shortest_path`, but grows whole BFS layers from both ends,
+        always expanding the smaller side, until the searches meet.
+        """
+        parents = [{source: None}, {target: None}]
+        distances = [{source: 0}, {target: 0}]
+        layers = [[source], [target]]
+
+        while layers[0] and layers[1]:
+            side = 0 if len(layers[0]) <= len(layers[1]) else 1
+            parent, distance = parents[side], distances[side]
+            other_distance = distances[1 - side]
+
+            # Expand the whole layer, remembering the best meeting point
+            next_layer = []
+            meeting = -1
+            best = None
+            for person in layers[side]:
+                self.num_explored += 1
+                for movie, star in self.costars(person):
+                    if star in parent:
+                        continue
+                    parent[star] = (movie, person)
+                    distance[star] = distance[person] + 1
+                    next_layer.append(star)
+                    if star in other_distance:
+                        total = distance[star] + other_distance[star]
+                        if best is None or total < best:
+                            meeting, best = star, total
+
+            if meeting != -1:
+                path = self.walk(parents[0], source, meeting)
+                person = meeting
+                while person != target:
+                    movie, person = parents[1][person]
+                    path.append((movie, person))
+                return path
+            layers[side] = next_layer
+
+        return None
+
+    def walk(self, parents, source, person):
+        """
+        Follows (movie, parent) links from `person` back to `source` and
+        returns the (movie, person) index pairs in order from the source.
+        """
+        path = []
+        while person != source:
+            movie, parent = parents[person]
+            path.append((movie, person))
+            person = parent
+        path.reverse()
+        return path
+
+    def parent_tree(self, source):
+        """
+        Runs one BFS from the source index over the whole graph and
+        returns its ParentTree.
+        """
+        n = len(self)
+        parents = array("i", [-1]) * n
+        parent_movies = array("i", [-1]) * n
+        distances = array("i", [-1]) * n
+        parents[source] = source
+        distances[source] = 0
+
+        layer = [source]
+        distance = 0
+        while layer:
+            distance += 1
+            next_layer = []
+            for person in layer:
+                for movie, star in self.costars(person):
+                    if parents[star] != -1:
+                        continue
+                    parents[star] = person
+                    parent_movies[star] = movie
+                    distances[star] = distance
+                    next_layer.append(star)
+            layer = next_layer
+
+        return ParentTree(source, parents, parent_movies, distances)
+
+
+class ParentTree():
+    """
+    Shortest paths from one person to everyone reachable, stored as
+    parent links over CostarIndex person numbers.
+    """
+
+    def __init__(self, source, parents, parent_movies, distances):
+        self.source = source
+        self.parents = parents
+        self.parent_movies = parent_movies
+        self.distances = distances
+
+    def __len__(self):
+        return len(self.parents)
+
+    def distance(self, person):
+        """
+        Returns the degrees from the source to a person, or None, also
+        for people added to the index after the tree was built.
+        """
+        if person >= len(self):
+            return None
+        distance = self.distances[person]
+        return None if distance == -1 else distance
+
+    def path(self, person):
+        """
+        Returns the (movie, person) index pairs leading from the source
+        to a person, or None if the person is not reachable.
+        """
+        if person >= len(self) or self.distances[person] == -1:
+            return None
+        path = []
+        while person != self.source:
+            path.append((self.parent_movies[person], person))
+            person = self.parents[person]
+        path.reverse()
+        return path
@@ -0,0 +1,131 @@
+import heapq
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+
+
+class NameIndex():
+    """
+    Prefix and trigram index over the lowercase names of the `names`
+    dictionary, used to suggest people for misspelled names.
+
+    Trigrams shared by more than `max_postings` names say little about
+    which name was meant, so they are not stored. That bounds both the
+    memory of the index and the work done per lookup.
+    """
+
+    def __init__(self, names, max_postings=5000):
+        self.ids = names
+        self.max_postings = max_postings
+
+        # Names are numbered in the order they were indexed, and also kept
+        # in sorted order for prefix lookups
+        self.names = sorted(names)
+        self.sorted_names = list(self.names)
+
+        # Number of distinct trigrams in each name
+        self.sizes = array("H")
+        postings = {}
+        for number, name in enumerate(self.names):
+            grams = trigrams(name)
+            self.sizes.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                postings.setdefault(gram, []).append(number)
+
+        self.postings = {}
+        self.common = set()
+        for gram, numbers in postings.items():
+            if len(numbers) > max_postings:
+                self.common.add(gram)
+            else:
+                self.postings[gram] = array("i", numbers)
+
+    def add(self, name):
+        """
+        Indexes a lowercase name that was added to the `names` dictionary
+        after the index was built.
+        """
+        number = len(self.names)
+        self.names.append(name)
+        insort(self.sorted_names, name)
+        grams = trigrams(name)
+        self.sizes.append(min(len(grams), 0xFFFF))
+        for gram in grams:
+            if gram in self.common:
+                continue
+            numbers = self.postings.setdefault(gram, array("i"))
+            numbers.append(number)
+            if len(numbers) > self.max_postings:
+                del self.postings[gram]
+                self.common.add(gram)
+
+    def prefixed(self, prefix, limit):
+        """Returns up to `limit` indexed names starting with `prefix`."""
+        found = []
+        i = bisect_left(self.sorted_names, prefix)
+        while (i < len(self.sorted_names) and len(found) < limit
+                and self.sorted_names[i].startswith(prefix)):
+            found.append(self.sorted_names[i])
+            i += 1
+        return found
+
+    def matches(self, name, limit=5, probes=4, min_prefix=3):
+        """
+        Returns up to `limit` (score, name) pairs for the indexed names
+        closest to `name`, best first. Scores run from 0 to 1.
+
+        Only the `probes` rarest trigrams of the query are looked up,
+        which keeps the cost of a lookup bounded on large indexes. Names
+        extending the query only score highly if it is at least
+        `min_prefix` characters long.
+        """
+        name = name.lower().strip()
+
+        # A letter or less says too little to suggest anyone
+        if len(name) < 2:
+            return []
+        grams = trigrams(name)
+        rare = sorted(
+            (gram for gram in grams if gram in self.postings),
+            key=lambda gram: len(self.postings[gram])
+        )
+
+        # Count the probed trigrams each name shares with the query
+        shared = Counter()
+        for gram in rare[:probes]:
+            shared.update(self.postings[gram])
+
+        # Score the names sharing the most with the Dice coefficient
+        # over their full trigram sets
+        scores = {}
+        for number, _ in shared.most_common(limit * 20):
+            match = self.names[number]
+            scores[match] = (2 * len(grams & trigrams(match))
+                             / (len(grams) + self.sizes[number]))
+
+        # Names that extend the query are good guesses for partial input
+        if len(name) >= min_prefix:
+            for prefixed in self.prefixed(name, limit):
+                scores[prefixed] = max(scores.get(prefixed, 0), 0.9)
+
+        return heapq.nlargest(
+            limit, ((score, match) for match, score in scores.items())
+        )
+
+    def candidates(self, name, limit=5, threshold=0.4):
+        """
+        Returns person_ids for the names closest to `name`, best first,
+        skipping names that score below `threshold`.
+        """
+        person_ids = []
+        for score, match in self.matches(name, limit):
+            if score < threshold:
+                break
+            person_ids.extend(sorted(self.ids[match]))
+        return person_ids
+
+
+def trigrams(name):
+    """Returns the set of trigrams of a name, padded at the start."""
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
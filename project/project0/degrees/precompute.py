@@ -0,0 +1,47 @@
+import sys
+import time
+
+import degrees
+from snapshot import write_trees
+
+
+def most_connected(n):
+    """
+    Returns the person_ids of the `n` people with the most co-star edges
+    in the co-star index.
+    """
+    index = degrees.index
+    people = sorted(
+        range(len(index)),
+        key=lambda person: index.offsets[person + 1] - index.offsets[person],
+        reverse=True
+    )
+    return [index.person_ids[person] for person in people[:n]]
+
+
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python precompute.py directory [n]")
+    directory = sys.argv[1]
+    n = int(sys.argv[2]) if len(sys.argv) == 3 else 100
+
+    print("Loading data...")
+    degrees.load_data(directory, indexed=True, snapshot=True)
+    print("Data loaded.")
+
+    # Compute trees straight from the index, bypassing the LRU cache
+    start = time.perf_counter()
+    trees = {}
+    for person_id in most_connected(n):
+        trees[person_id] = degrees.index.parent_tree(
+            degrees.index.person_index[person_id]
+        )
+    elapsed = time.perf_counter() - start
+    print(f"Computed {len(trees)} parent trees in {elapsed:.1f} s")
+
+    write_trees(directory, trees)
+    print("Parent trees saved.")
+
+
+if __name__ == "__main__":
+    main()
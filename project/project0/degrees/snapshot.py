@@ -0,0 +1,414 @@
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+
+from graph import CostarIndex
+
+# Name of the snapshot file written inside a data directory
+SNAPSHOT = "degrees.snapshot"
+
+# Bumped whenever the layout below changes
+MAGIC = b"DEGREES2"
+
+CSV_FILES = ["people.csv", "movies.csv", "stars.csv"]
+
+"""
+Layout of a snapshot file:
+
+    MAGIC                   8 bytes
+    header length           8 bytes, little endian
+    header                  pickled dictionary, see write_snapshot
+    padding                 up to the next multiple of 8 bytes
+    sections                raw int arrays and UTF-8 string blobs, each
+                            padded to a multiple of 8 bytes
+
+The sections hold the CostarIndex arrays, the stars of every movie, and
+the ids, names, births, titles and years of people and movies as string
+tables, along with the order that sorts each table for lookups. They
+are memory-mapped on load rather than read, and the names, people and
+movies dictionaries are replaced by mappings that build each entry from
+them the first time it is looked up, so loading takes about as long
+whatever the size of the data.
+"""
+
+
+class StringTable(Sequence):
+    """
+    Strings stored end to end in a UTF-8 blob, string i ending at byte
+    ends[i]. Strings appended later are kept in a list after them.
+    """
+
+    def __init__(self, ends, blob):
+        self.ends = ends
+        self.blob = blob
+        self.added = []
+
+    @staticmethod
+    def pack(strings):
+        """Returns the (ends, blob) of a table holding the strings."""
+        ends = array("i")
+        blob = bytearray()
+        for string in strings:
+            blob += string.encode("utf-8")
+            ends.append(len(blob))
+        return ends, bytes(blob)
+
+    def __len__(self):
+        return len(self.ends) + len(self.added)
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError("string table index out of range")
+        if i >= len(self.ends):
+            return self.added[i - len(self.ends)]
+        start = self.ends[i - 1] if i else 0
+        return str(self.blob[start:self.ends[i]], "utf-8")
+
+    def append(self, string):
+        self.added.append(string)
+
+
+class StringIndex(Mapping):
+    """
+    Maps each string of a StringTable to its position, by binary search
+    over `order`, the positions sorted by their strings. Strings appended
+    to the table must also be given their position here.
+    """
+
+    def __init__(self, strings, order):
+        self.strings = strings
+        self.order = order
+        self.added = {}
+
+    def __getitem__(self, key):
+        low, high = 0, len(self.order)
+        while low < high:
+            middle = (low + high) // 2
+            if self.strings[self.order[middle]] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.order) and self.strings[self.order[low]] == key:
+            return self.order[low]
+        return self.added[key]
+
+    def __setitem__(self, key, position):
+        self.added[key] = position
+
+    def __iter__(self):
+        return iter(self.strings)
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class Records(Mapping):
+    """
+    Dictionary from the ids of a StringIndex to records, each built by
+    calling build(position) the first time it is looked up, and kept so
+    that changes to it last. Records can also be set for new ids.
+    """
+
+    def __init__(self, ids, build):
+        self.ids = ids
+        self.build = build
+        self.records = {}
+        self.new = set()
+
+    def __getitem__(self, key):
+        if key not in self.records:
+            self.records[key] = self.build(self.ids[key])
+        return self.records[key]
+
+    def __setitem__(self, key, record):
+        if key not in self.ids:
+            self.new.add(key)
+        self.records[key] = record
+
+    def __contains__(self, key):
+        return key in self.records or key in self.ids
+
+    def __iter__(self):
+        yield from self.ids
+        for key in self.new:
+            if key not in self.ids:
+                yield key
+
+    def __len__(self):
+        return len(self.ids) + sum(key not in self.ids for key in self.new)
+
+
+class Names(Mapping):
+    """
+    Dictionary from lowercase names to the set of ids of the people with
+    that name, found by binary search over `order`, the positions of the
+    people sorted by lowercase name. Sets are kept once looked up, so
+    that changes to them last, and can be set for new names.
+    """
+
+    def __init__(self, names, order, ids):
+        self.names = names
+        self.order = order
+        self.ids = ids
+        self.sets = {}
+        self.new = set()
+        self.count = None
+
+    def name(self, i):
+        """Returns the lowercase name at position i of `order`."""
+        return self.names[self.order[i]].lower()
+
+    def table_ids(self, name):
+        """Returns the set of ids of the people in the table with a name."""
+        low, high = 0, len(self.order)
+        while low < high:
+            middle = (low + high) // 2
+            if self.name(middle) < name:
+                low = middle + 1
+            else:
+                high = middle
+        person_ids = set()
+        while low < len(self.order) and self.name(low) == name:
+            person_ids.add(self.ids[self.order[low]])
+            low += 1
+        return person_ids
+
+    def __getitem__(self, name):
+        if name not in self.sets:
+            person_ids = self.table_ids(name)
+            if not person_ids:
+                raise KeyError(name)
+            self.sets[name] = person_ids
+        return self.sets[name]
+
+    def __setitem__(self, name, person_ids):
+        if name not in self.sets and not self.table_ids(name):
+            self.new.add(name)
+        self.sets[name] = person_ids
+
+    def table_names(self):
+        """Yields the distinct lowercase names in the table, in order."""
+        previous = None
+        for i in range(len(self.order)):
+            name = self.name(i)
+            if name != previous:
+                yield name
+                previous = name
+
+    def __iter__(self):
+        yield from self.table_names()
+        yield from self.new
+
+    def __len__(self):
+        if self.count is None:
+            self.count = sum(1 for _ in self.table_names())
+        return self.count + len(self.new)
+
+
+def csv_stamp(directory):
+    """
+    Returns the size and modification time of each CSV file, which
+    decides whether a snapshot is still valid.
+    """
+    stamp = []
+    for filename in CSV_FILES:
+        stat = os.stat(os.path.join(directory, filename))
+        stamp.append((filename, stat.st_size, stat.st_mtime_ns))
+    return stamp
+
+
+def padding(length):
+    """Returns the number of bytes needed to align `length` to 8."""
+    return -length % 8
+
+
+def write_snapshot(directory, names, people, movies, index):
+    """
+    Writes the loaded dictionaries and co-star index of `directory` to
+    its snapshot file.
+    """
+    person_ids, movie_ids = index.person_ids, index.movie_ids
+    person_names = [people[person_id]["name"] for person_id in person_ids]
+
+    # Stars of each movie in compressed sparse row form, like the index
+    star_offsets = array("i", [0])
+    stars = array("i")
+    for movie_id in movie_ids:
+        stars.extend(
+            index.person_index[star] for star in movies[movie_id]["stars"]
+        )
+        star_offsets.append(len(stars))
+
+    sections = {
+        "offsets": index.offsets,
+        "neighbors": index.neighbors,
+        "edge_movies": index.edge_movies,
+        "star_offsets": star_offsets,
+        "stars": stars,
+        "person_order": array("i", sorted(
+            range(len(person_ids)), key=person_ids.__getitem__
+        )),
+        "movie_order": array("i", sorted(
+            range(len(movie_ids)), key=movie_ids.__getitem__
+        )),
+        "name_order": array("i", sorted(
+            range(len(person_ids)), key=lambda i: person_names[i].lower()
+        )),
+    }
+    tables = {
+        "person_ids": person_ids,
+        "person_names": person_names,
+        "births": [people[person_id]["birth"] for person_id in person_ids],
+        "movie_ids": movie_ids,
+        "titles": [movies[movie_id]["title"] for movie_id in movie_ids],
+        "years": [movies[movie_id]["year"] for movie_id in movie_ids],
+    }
+    for name, strings in tables.items():
+        sections[name + "_ends"], sections[name] = StringTable.pack(strings)
+
+    header = pickle.dumps({
+        "stamp": csv_stamp(directory),
+        "byteorder": sys.byteorder,
+        "itemsize": CostarIndex.ITEMSIZE,
+        "sections": [
+            (name, "i" if isinstance(values, array) else "B", len(values))
+            for name, values in sections.items()
+        ],
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # Write to a temporary file first so readers never see half a snapshot
+    filename = os.path.join(directory, SNAPSHOT)
+    with open(filename + ".tmp", "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        f.write(bytes(padding(len(MAGIC) + 8 + len(header))))
+        for values in sections.values():
+            data = values.tobytes() if isinstance(values, array) else values
+            f.write(data)
+            f.write(bytes(padding(len(data))))
+    os.replace(filename + ".tmp", filename)
+
+
+def read_snapshot(directory):
+    """
+    Returns (names, people, movies, index) from the snapshot file of
+    `directory`, or None if there is no snapshot, or it is out of date,
+    truncated or otherwise unreadable.
+    """
+    # Whatever is wrong with a snapshot, loading falls back to the CSV
+    # files, which then write a fresh one
+    try:
+        return load_snapshot(directory)
+    except Exception:
+        return None
+
+
+def load_snapshot(directory):
+    """
+    Returns (names, people, movies, index) from the snapshot file of
+    `directory`, or None if it is out of date. Raises an exception if
+    the file is missing or cannot be read.
+    """
+    with open(os.path.join(directory, SNAPSHOT), "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return None
+        length, = struct.unpack("<Q", f.read(8))
+        header = pickle.loads(f.read(length))
+        if header["stamp"] != csv_stamp(directory):
+            return None
+        if (header["byteorder"] != sys.byteorder
+                or header["itemsize"] != CostarIndex.ITEMSIZE):
+            return None
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # Slice the sections straight out of the mapping
+    sections = {}
+    position = len(MAGIC) + 8 + length
+    position += padding(position)
+    view = memoryview(buffer)
+    for name, typecode, count in header["sections"]:
+        size = count * (CostarIndex.ITEMSIZE if typecode == "i" else 1)
+        sections[name] = view[position:position + size].cast(typecode)
+        position += size + padding(size)
+    if position > len(buffer):
+        return None
+
+    def table(name):
+        return StringTable(sections[name + "_ends"], sections[name])
+
+    person_ids, movie_ids = table("person_ids"), table("movie_ids")
+    person_index = StringIndex(person_ids, sections["person_order"])
+    movie_index = StringIndex(movie_ids, sections["movie_order"])
+    person_names, births = table("person_names"), table("births")
+    titles, years = table("titles"), table("years")
+    offsets, edge_movies = sections["offsets"], sections["edge_movies"]
+    star_offsets, stars = sections["star_offsets"], sections["stars"]
+
+    def person(i):
+        return {
+            "name": person_names[i],
+            "birth": births[i],
+            "movies": {
+                movie_ids[movie]
+                for movie in edge_movies[offsets[i]:offsets[i + 1]]
+            }
+        }
+
+    def movie(i):
+        return {
+            "title": titles[i],
+            "year": years[i],
+            "stars": {
+                person_ids[star]
+                for star in stars[star_offsets[i]:star_offsets[i + 1]]
+            }
+        }
+
+    index = CostarIndex.from_arrays(
+        person_ids, movie_ids, offsets, sections["neighbors"], edge_movies,
+        person_index, movie_index
+    )
+    index.buffer = buffer
+    names = Names(person_names, sections["name_order"], person_ids)
+    people = Records(person_index, person)
+    movies = Records(movie_index, movie)
+    return names, people, movies, index
+
+
+# Name of the file holding precomputed parent trees inside a data directory
+TREES = "degrees.trees"
+
+
+def write_trees(directory, trees):
+    """
+    Writes a dictionary of person_id -> ParentTree to the trees file of
+    `directory`.
+    """
+    filename = os.path.join(directory, TREES)
+    with open(filename + ".tmp", "wb") as f:
+        pickle.dump({
+            "stamp": csv_stamp(directory),
+            "trees": trees,
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(filename + ".tmp", filename)
+
+
+def read_trees(directory):
+    """
+    Returns the dictionary of precomputed parent trees of `directory`,
+    or an empty one if there is none, or it is out of date, truncated or
+    otherwise unreadable.
+    """
+    try:
+        with open(os.path.join(directory, TREES), "rb") as f:
+            data = pickle.load(f)
+        if data["stamp"] != csv_stamp(directory):
+            return {}
+        return data["trees"]
+    except Exception:
+        return {}
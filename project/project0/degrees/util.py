@@ -1,3 +1,6 @@
+from collections import deque
+
+
 class Node():
     def __init__(self, state, parent, action):
         self.state = state
@@ -7,24 +10,35 @@ class Node():
 
 class StackFrontier():
     def __init__(self):
-        self.frontier = []
+        self.frontier = deque()
+
+        # Number of nodes in the frontier for each state, so membership
+        # checks do not have to scan the whole frontier
+        self.states = {}
 
     def add(self, node):
         self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
 
+    def untrack(self, node):
+        count = self.states[node.state] - 1
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]
+        return node
+
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
-            return node
+            return self.untrack(self.frontier.pop())
 
 
 class QueueFrontier(StackFrontier):
@@ -33,6 +47,4 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
+            return self.untrack(self.frontier.popleft())
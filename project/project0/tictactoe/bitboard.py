@@ -0,0 +1,257 @@
+"""
+Tic Tac Toe on bitboards
+
+A board is a pair of 9-bit integers (x, o), one per player, where bit
+3 * i + j is set if that player has marked cell (i, j).
+"""
+
+import math
+
+X = "X"
+O = "O"
+EMPTY = None
+
+FULL = 0b111111111
+
+# Cells of every row, column and diagonal
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+]
+
+# Number of set bits in every 9-bit mask
+POPCOUNT = [bin(mask).count("1") for mask in range(FULL + 1)]
+
+# Bound types of transposition table entries
+EXACT = "exact"
+LOWER = "lower"
+UPPER = "upper"
+
+# Maps canonical boards to (value, bound type) from earlier searches
+transpositions = {}
+
+# Number of positions visited by the most recent call to minimax
+nodes_visited = 0
+
+
+def symmetry_tables():
+    """
+    Returns, for each of the 8 rotations and reflections of the board,
+    a table mapping every 9-bit mask to its transformed mask.
+    """
+    cells = [[3 * i + j for j in range(3)] for i in range(3)]
+    permutations = []
+    for _ in range(4):
+        cells = [list(row) for row in zip(*cells[::-1])]
+        permutations.append([cell for row in cells for cell in row])
+        permutations.append([cell for row in cells for cell in row[::-1]])
+
+    tables = []
+    for permutation in permutations:
+        table = []
+        for mask in range(FULL + 1):
+            moved = 0
+            for target, source in enumerate(permutation):
+                if mask >> source & 1:
+                    moved |= 1 << target
+            table.append(moved)
+        tables.append(table)
+    return tables
+
+
+SYMMETRIES = symmetry_tables()
+
+
+def to_bits(board):
+    """
+    Returns the (x, o) bitboards of a list-of-lists board.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+def to_board(x, o):
+    """
+    Returns the list-of-lists board of (x, o) bitboards.
+    """
+    return [
+        [X if x >> (3 * i + j) & 1 else O if o >> (3 * i + j) & 1 else EMPTY
+         for j in range(3)]
+        for i in range(3)
+    ]
+
+
+def to_action(move):
+    """
+    Returns the (i, j) action of a cell number.
+    """
+    return divmod(move, 3)
+
+
+def player(x, o):
+    """
+    Returns player who has the next turn.
+    """
+    return X if POPCOUNT[x] == POPCOUNT[o] else O
+
+
+def actions(x, o):
+    """
+    Returns the list of empty cell numbers.
+    """
+    empty = ~(x | o) & FULL
+    return [move for move in range(9) if empty >> move & 1]
+
+
+def result(x, o, move):
+    """
+    Returns the (x, o) bitboards after the current player marks a cell.
+    """
+    if (x | o) >> move & 1:
+        raise Exception("Invalid move")
+    if POPCOUNT[x] == POPCOUNT[o]:
+        return x | 1 << move, o
+    return x, o | 1 << move
+
+
+def wins(bits):
+    """
+    Returns True if the bits contain a full row, column or diagonal.
+    """
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+def winner(x, o):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    if wins(x):
+        return X
+    if wins(o):
+        return O
+    return None
+
+
+def terminal(x, o):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    return (x | o) == FULL or wins(x) or wins(o)
+
+
+def utility(x, o):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    if wins(x):
+        return 1
+    if wins(o):
+        return -1
+    return 0
+
+
+def canonical(x, o):
+    """
+    Returns a key for the board that is the same for all of its
+    rotations and reflections.
+    """
+    return min(table[x] | table[o] << 9 for table in SYMMETRIES)
+
+
+def alphabeta(x, o, alpha, beta):
+    """
+    Returns the minimax value of the board, searching with alpha-beta
+    pruning and the transposition table.
+
+    The result is exact if it lies strictly between alpha and beta;
+    otherwise it is only a bound on the exact value.
+    """
+    global nodes_visited
+    nodes_visited += 1
+
+    if wins(x):
+        return 1
+    if wins(o):
+        return -1
+    occupied = x | o
+    if occupied == FULL:
+        return 0
+
+    # Reuse what earlier searches learned about this position
+    key = canonical(x, o)
+    if key in transpositions:
+        value, flag = transpositions[key]
+        if flag == EXACT:
+            return value
+        if flag == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+
+    original_alpha, original_beta = alpha, beta
+    if POPCOUNT[x] == POPCOUNT[o]:
+        value = -math.inf
+        for move in range(9):
+            if occupied >> move & 1:
+                continue
+            value = max(value, alphabeta(x | 1 << move, o, alpha, beta))
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+    else:
+        value = math.inf
+        for move in range(9):
+            if occupied >> move & 1:
+                continue
+            value = min(value, alphabeta(x, o | 1 << move, alpha, beta))
+            beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+    if value <= original_alpha:
+        transpositions[key] = (value, UPPER)
+    elif value >= original_beta:
+        transpositions[key] = (value, LOWER)
+    else:
+        transpositions[key] = (value, EXACT)
+    return value
+
+
+def minimax(x, o):
+    """
+    Returns the optimal cell number for the current player, or None if
+    the game is over.
+    """
+    global nodes_visited
+    nodes_visited = 0
+
+    if terminal(x, o):
+        return None
+
+    # Each child only has to beat the best value found so far
+    best_move = None
+    if player(x, o) == X:
+        best_value = -2
+        for move in actions(x, o):
+            value = alphabeta(x | 1 << move, o, best_value, 2)
+            if value > best_value:
+                best_value, best_move = value, move
+    else:
+        best_value = 2
+        for move in actions(x, o):
+            value = alphabeta(x, o | 1 << move, -2, best_value)
+            if value < best_value:
+                best_value, best_move = value, move
+    return best_move
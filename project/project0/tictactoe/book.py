@@ -0,0 +1,153 @@
+"""
+Perfect-play opening book for Tic Tac Toe
+
+Usage:
+    python book.py generate    solve every reachable position into book.bin
+    python book.py validate    check book.bin against live search
+"""
+
+import os
+import struct
+import sys
+from array import array
+
+import bitboard
+import tictactoe as ttt
+
+BOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+
+MAGIC = b"TTTBOOK1"
+
+"""
+Layout of a book file:
+
+    MAGIC                   8 bytes
+    number of positions     4 bytes, little endian
+    keys                    sorted uint32 keys, x | o << 9 of each position
+    moves                   one byte per key, the cell number 3 * i + j
+                            of the best move
+"""
+
+
+def key(board):
+    """Returns the book key of a list-of-lists board."""
+    x, o = bitboard.to_bits(board)
+    return x | o << 9
+
+
+def solve():
+    """
+    Solves every reachable non-terminal position with the list-based
+    rules of tictactoe.py, and returns a dictionary mapping book keys to
+    the best move. Ties go to the lowest cell number, like live search.
+    """
+    values = {}
+
+    def value(board):
+        """Returns the minimax value of a board, filling in `moves`."""
+        board_key = key(board)
+        if board_key in values:
+            return values[board_key]
+        if ttt.terminal(board):
+            values[board_key] = ttt.utility(board)
+            return values[board_key]
+
+        sign = 1 if ttt.player(board) == ttt.X else -1
+        best_value, best_move = None, None
+        for i, j in sorted(ttt.actions(board)):
+            child = sign * value(ttt.result(board, (i, j)))
+            if best_value is None or child > best_value:
+                best_value, best_move = child, 3 * i + j
+        values[board_key] = sign * best_value
+        moves[board_key] = best_move
+        return values[board_key]
+
+    moves = {}
+    value(ttt.initial_state())
+    return moves
+
+
+def write_book(moves, filename=BOOK):
+    """Writes a dictionary of book keys to moves to a book file."""
+    keys = array("I", sorted(moves))
+    if sys.byteorder != "little":
+        keys.byteswap()
+
+    # Write to a temporary file first, so an interrupted write never
+    # leaves a partial book behind
+    temporary = filename + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(keys)))
+        f.write(keys.tobytes())
+        f.write(bytes(moves[board_key] for board_key in sorted(moves)))
+    os.replace(temporary, filename)
+
+
+def read_book(filename=BOOK):
+    """
+    Returns the dictionary of book keys to moves in a book file, or None
+    if there is no book file or it cannot be read, so that callers fall
+    back to live search.
+    """
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    # Reject files that are not books, or truncated or corrupt ones
+    start = len(MAGIC) + 4
+    if len(data) < start or data[:len(MAGIC)] != MAGIC:
+        return None
+    count, = struct.unpack_from("<I", data, len(MAGIC))
+    if len(data) != start + 5 * count:
+        return None
+    moves = data[start + 4 * count:]
+    if any(move > 8 for move in moves):
+        return None
+    keys = array("I")
+    keys.frombytes(data[start:start + 4 * count])
+    if sys.byteorder != "little":
+        keys.byteswap()
+    return dict(zip(keys, moves))
+
+
+def validate(moves):
+    """
+    Checks every book move against a fresh live search, and returns the
+    number of positions where they disagree.
+    """
+    mismatches = 0
+    bitboard.transpositions.clear()
+    for board_key, move in moves.items():
+        x, o = board_key & bitboard.FULL, board_key >> 9
+        live = bitboard.minimax(x, o)
+        if live != move:
+            mismatches += 1
+            print(f"Mismatch: {bitboard.to_board(x, o)} book {move} "
+                  f"live {live}")
+    return mismatches
+
+
+def main():
+    if len(sys.argv) != 2 or sys.argv[1] not in ["generate", "validate"]:
+        sys.exit("Usage: python book.py generate|validate")
+
+    if sys.argv[1] == "generate":
+        moves = solve()
+        write_book(moves)
+        print(f"Wrote {len(moves)} positions to {BOOK} "
+              f"({os.path.getsize(BOOK)} bytes).")
+    else:
+        moves = read_book()
+        if moves is None:
+            sys.exit("No book, run: python book.py generate")
+        mismatches = validate(moves)
+        print(f"Checked {len(moves)} positions, {mismatches} mismatches.")
+        if mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
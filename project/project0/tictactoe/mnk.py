@@ -0,0 +1,335 @@
+"""
+Generalized m,n,k Tic Tac Toe Player
+
+Boards have m rows and n columns, and a player wins with k marks in a
+row, column or diagonal. Boards use the same list-of-lists format as
+tictactoe.py, so Game(3, 3, 3) plays ordinary Tic Tac Toe.
+"""
+
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Score of a won position, before subtracting the number of plies to it
+WIN = 1000000
+
+
+class Timeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+class Game():
+
+    def __init__(self, m=3, n=3, k=3, time_budget_ms=1000):
+        """
+        Create an m-row, n-column game won with k in a row. `minimax`
+        stops searching after `time_budget_ms` milliseconds per move.
+        """
+        if not 1 <= k <= max(m, n):
+            raise ValueError("k must fit on the board")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.time_budget_ms = time_budget_ms
+
+        # Every line of k cells (as flat cell numbers i * n + j) that
+        # wins, and the numbers of the lines through each cell
+        self.windows = []
+        for i in range(m):
+            for j in range(n):
+                for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < m and 0 <= end_j < n:
+                        self.windows.append(tuple(
+                            (i + di * step) * n + j + dj * step
+                            for step in range(k)
+                        ))
+        self.cell_windows = [[] for _ in range(m * n)]
+        for number, window in enumerate(self.windows):
+            for cell in window:
+                self.cell_windows[cell].append(number)
+
+        # Cells ordered from the center outwards, for move ordering
+        self.center_order = sorted(
+            range(m * n),
+            key=lambda cell: (abs(cell // n - (m - 1) / 2)
+                              + abs(cell % n - (n - 1) / 2))
+        )
+
+        # Score of a window holding only one player's marks, by count
+        self.weights = [0] + [10 ** count for count in range(k - 1)] + [WIN]
+
+        # Statistics of the most recent call to minimax
+        self.nodes_visited = 0
+        self.depth_reached = 0
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        cells = [cell for row in board for cell in row]
+        return X if cells.count(X) == cells.count(O) else O
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return set(
+            (i, j)
+            for i in range(self.m)
+            for j in range(self.n)
+            if board[i][j] == EMPTY
+        )
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if not (0 <= i < self.m and 0 <= j < self.n) or board[i][j] != EMPTY:
+            raise Exception("Invalid move")
+        board_copy = [list(row) for row in board]
+        board_copy[i][j] = self.player(board)
+        return board_copy
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        cells = [cell for row in board for cell in row]
+        for window in self.windows:
+            first = cells[window[0]]
+            if first != EMPTY and all(cells[cell] == first for cell in window):
+                return first
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return (self.winner(board) is not None
+                or all(cell != EMPTY for row in board for cell in row))
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        game_winner = self.winner(board)
+        if game_winner == X:
+            return 1
+        if game_winner == O:
+            return -1
+        return 0
+
+    def minimax(self, board, time_budget_ms=None):
+        """
+        Returns the best action found for the current player on the
+        board within the time budget, or None if the game is over.
+
+        Searches with iterative deepening: each depth runs a complete
+        alpha-beta search, and the move of the deepest finished depth is
+        returned. If not even depth 1 finishes, the best move it had
+        found so far is returned, or the first move it would have tried.
+        """
+        if self.terminal(board):
+            return None
+        if time_budget_ms is None:
+            time_budget_ms = self.time_budget_ms
+
+        cells = [cell for row in board for cell in row]
+        me = self.player(board)
+        empty = cells.count(EMPTY)
+        self.deadline = time.perf_counter() + time_budget_ms / 1000
+        self.nodes_visited = 0
+        self.depth_reached = 0
+        self.transpositions = {}
+
+        # Marks of each player in every window, and the heuristic score
+        # for X, kept up to date as the search makes and takes back moves
+        self.counts = {X: [0] * len(self.windows), O: [0] * len(self.windows)}
+        for number, window in enumerate(self.windows):
+            for cell in window:
+                if cells[cell] != EMPTY:
+                    self.counts[cells[cell]][number] += 1
+        self.score = self.evaluate(cells, X)
+
+        best_move = None
+        for depth in range(1, empty + 1):
+            try:
+                value, move = self.root(cells, me, depth, best_move)
+            except Timeout:
+                if best_move is None:
+                    best_move = self.partial_move
+                break
+            best_move = move
+            self.depth_reached = depth
+
+            # A forced result will not change with more depth
+            if abs(value) >= WIN - empty:
+                break
+            if time.perf_counter() >= self.deadline:
+                break
+
+        return divmod(best_move, self.n)
+
+    def root(self, cells, me, depth, first):
+        """
+        Runs one alpha-beta search of the given depth from the root and
+        returns (value, move), trying the move `first` before the others.
+        """
+        moves = self.ordered_moves(cells, first)
+
+        # Best move so far, in case time runs out before depth 1 finishes
+        self.partial_move = moves[0]
+
+        best_value, best_move = -WIN - 1, None
+        alpha, beta = -WIN - 1, WIN + 1
+        for move in moves:
+            value = -self.search(cells, me, move, depth - 1, 1, -beta, -alpha)
+            if value > best_value:
+                best_value, best_move = value, move
+                self.partial_move = move
+            alpha = max(alpha, value)
+            if time.perf_counter() >= self.deadline:
+                raise Timeout
+        return best_value, best_move
+
+    def search(self, cells, mover, move, depth, ply, alpha, beta):
+        """
+        Plays `move` for `mover`, returns the negamax value of the result
+        for the other player, and takes the move back.
+        """
+        self.nodes_visited += 1
+        if (self.nodes_visited & 255 == 0
+                and time.perf_counter() >= self.deadline):
+            raise Timeout
+
+        cells[move] = mover
+        won = self.place(move, mover, 1)
+        try:
+            if won:
+                return -(WIN - ply)
+            if EMPTY not in cells:
+                return 0
+            opponent = O if mover == X else X
+            if depth == 0:
+                return self.score if opponent == X else -self.score
+
+            # Probe the transposition table
+            key = (tuple(cells), opponent)
+            entry = self.transpositions.get(key)
+            best_first = None
+            if entry is not None:
+                entry_depth, value, flag, best_first = entry
+                if entry_depth >= depth:
+                    if flag == "exact":
+                        return value
+                    if flag == "lower":
+                        alpha = max(alpha, value)
+                    else:
+                        beta = min(beta, value)
+                    if alpha >= beta:
+                        return value
+
+            original_alpha = alpha
+            best_value, best_move = -WIN - 1, None
+            for reply in self.ordered_moves(cells, best_first):
+                value = -self.search(
+                    cells, opponent, reply, depth - 1, ply + 1, -beta, -alpha
+                )
+                if value > best_value:
+                    best_value, best_move = value, reply
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    break
+
+            if best_value <= original_alpha:
+                flag = "upper"
+            elif best_value >= beta:
+                flag = "lower"
+            else:
+                flag = "exact"
+            self.transpositions[key] = (depth, best_value, flag, best_move)
+            return best_value
+        finally:
+            cells[move] = EMPTY
+            self.place(move, mover, -1)
+
+    def place(self, cell, mover, step):
+        """
+        Adds (step 1) or removes (step -1) a mark of `mover` in the window
+        counts, updating the score for X from the windows through the
+        cell only. Returns True if a window is now full of the mark.
+        """
+        counts = self.counts[mover]
+        xs, os = self.counts[X], self.counts[O]
+        weights = self.weights
+        score = self.score
+        full = False
+        for number in self.cell_windows[cell]:
+            x, o = xs[number], os[number]
+            if x and not o:
+                score -= weights[x]
+            elif o and not x:
+                score += weights[o]
+            counts[number] += step
+            x, o = xs[number], os[number]
+            if x and not o:
+                score += weights[x]
+            elif o and not x:
+                score -= weights[o]
+            if counts[number] == self.k:
+                full = True
+        self.score = score
+        return full
+
+    def ordered_moves(self, cells, first=None):
+        """
+        Returns the empty cells, trying `first` first, then cells that
+        share a line with existing marks, each group from the center
+        outwards.
+        """
+        lined = set()
+        for cell, mark in enumerate(cells):
+            if mark != EMPTY:
+                for number in self.cell_windows[cell]:
+                    lined.update(self.windows[number])
+
+        near = []
+        far = []
+        for cell in self.center_order:
+            if cells[cell] != EMPTY or cell == first:
+                continue
+            if cell in lined:
+                near.append(cell)
+            else:
+                far.append(cell)
+        return ([first] if first is not None else []) + near + far
+
+    def evaluate(self, cells, me):
+        """
+        Returns a heuristic score of the position for `me`: windows that
+        only one player has marks in count for that player, weighted by
+        how many marks they hold.
+        """
+        score = 0
+        for window in self.windows:
+            mine = theirs = 0
+            for cell in window:
+                if cells[cell] == me:
+                    mine += 1
+                elif cells[cell] != EMPTY:
+                    theirs += 1
+            if mine and not theirs:
+                score += self.weights[mine]
+            elif theirs and not mine:
+                score -= self.weights[theirs]
+        return score
@@ -0,0 +1,98 @@
+"""
+Headless self-play harness for the Tic Tac Toe AI
+
+Usage: python selfplay.py [games] [ai|random] [workers]
+
+Plays games of the AI against itself or against a random player across
+a process pool, and reports throughput, per-move latency percentiles and
+node counts. Every game starts with an empty transposition table and no
+opening book, so the numbers measure the search itself.
+"""
+
+import multiprocessing
+import random
+import sys
+import time
+
+import bitboard
+import tictactoe as ttt
+
+
+def start_worker():
+    """Turns off the opening book in a worker process."""
+    ttt.opening_book = False
+
+
+def play(game):
+    """
+    Plays one game and returns (winner, [(seconds, nodes), ...]) with
+    the latency and node count of every AI move. In games against the
+    random player, the AI plays X in even games and O in odd games.
+    """
+    number, opponent = game
+    rng = random.Random(number)
+    ai_players = {ttt.X, ttt.O}
+    if opponent == "random":
+        ai_players = {ttt.X if number % 2 == 0 else ttt.O}
+
+    bitboard.transpositions.clear()
+    board = ttt.initial_state()
+    moves = []
+    while not ttt.terminal(board):
+        if ttt.player(board) in ai_players:
+            start = time.perf_counter()
+            action = ttt.minimax(board)
+            moves.append((time.perf_counter() - start, ttt.nodes_visited))
+        else:
+            action = rng.choice(sorted(ttt.actions(board)))
+        board = ttt.result(board, action)
+    return ttt.winner(board), moves
+
+
+def percentile(values, fraction):
+    """Returns the value at `fraction` of the way through sorted values."""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    if len(sys.argv) > 4:
+        sys.exit("Usage: python selfplay.py [games] [ai|random] [workers]")
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    opponent = sys.argv[2] if len(sys.argv) > 2 else "ai"
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    if opponent not in ["ai", "random"]:
+        sys.exit("Opponent must be ai or random")
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers, initializer=start_worker) as pool:
+        results = pool.map(
+            play, [(number, opponent) for number in range(games)],
+            chunksize=max(1, games // 64)
+        )
+    elapsed = time.perf_counter() - start
+
+    outcomes = {ttt.X: 0, ttt.O: 0, None: 0}
+    latencies = []
+    nodes = []
+    for winner, moves in results:
+        outcomes[winner] += 1
+        for seconds, count in moves:
+            latencies.append(seconds)
+            nodes.append(count)
+    latencies.sort()
+
+    print(f"{games} games ({opponent} opponent) in {elapsed:.2f} s: "
+          f"{games / elapsed:.1f} games/s")
+    print(f"X wins: {outcomes[ttt.X]}, O wins: {outcomes[ttt.O]}, "
+          f"ties: {outcomes[None]}")
+    print(f"{len(latencies)} AI moves, latency "
+          f"p50 {percentile(latencies, 0.5) * 1000:.3f} ms, "
+          f"p90 {percentile(latencies, 0.9) * 1000:.3f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.3f} ms, "
+          f"max {latencies[-1] * 1000:.3f} ms")
+    print(f"Nodes per move: mean {sum(nodes) / len(nodes):.1f}, "
+          f"max {max(nodes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,20 @@
 Tic Tac Toe Player
 """
 
-import math
+import bitboard
+import book
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Number of positions visited by the most recent call to minimax
+nodes_visited = 0
+
+# Opening book mapping bitboard keys to best moves, loaded on first use;
+# False if there is no book file
+opening_book = None
+
 
 def initial_state():
     """
@@ -123,47 +131,27 @@ def utility(board):
     return 0
 
 
-def minimax_score(board, action):
-    """
-    a helper function of minimax, to return a minimax score of a action
-    """
-    update_board = result(board, action)
-    if terminal(update_board):
-        return utility(update_board)
-    update_actions = actions(update_board)
-    update_player = player(update_board)
-    score = []
-    if update_player == X:
-        for action in update_actions:
-            score.append(minimax_score(update_board, action))
-            return max(score)
-    if update_player == O:
-        for action in update_actions:
-            score.append(minimax_score(update_board, action))
-            return min(score)
-
-
 def minimax(board):
     """
     Returns the optimal action for the current player on the board.
+
+    Positions in the opening book are answered by lookup; the search
+    itself runs on bitboards, see bitboard.py.
     """
-    if terminal(board):
+    global nodes_visited, opening_book
+    if opening_book is None:
+        opening_book = book.read_book() or False
+
+    x, o = bitboard.to_bits(board)
+    if opening_book and x | o << 9 in opening_book:
+        nodes_visited = 0
+        return bitboard.to_action(opening_book[x | o << 9])
+
+    move = bitboard.minimax(x, o)
+    nodes_visited = bitboard.nodes_visited
+    if move is None:
         return None
-    possible_actions = actions(board)
-    current_player = player(board)
-    action_score_pair = {}
-    for action in possible_actions:
-        action_score_pair.update({action: minimax_score(board, action)})
-    if current_player == X:
-        max_score = max(action_score_pair.values())
-        for key in action_score_pair.keys():
-            if action_score_pair[key] == max_score:
-                return key
-    if current_player == O:
-        min_score = min(action_score_pair.values())
-        for key in action_score_pair.keys():
-            if action_score_pair[key] == min_score:
-                return key
+    return bitboard.to_action(move)
 
 
 def main():
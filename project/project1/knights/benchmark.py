@@ -0,0 +1,154 @@
+"""
+Benchmark of parallel and batch model checking
+
+Usage: python benchmark.py [processes]
+       python benchmark.py batch [puzzles]
+
+Times the bitwise and parallel engines of logic.py, checking that they
+agree, on the knights puzzles and on synthetic "exactly one of n"
+knowledge bases of 24 to 27 symbols.
+
+With batch, instead times solving thousands of random knights and knaves
+puzzles one model_check at a time and all together with
+batch_model_check, checking that the answers agree.
+"""
+
+import os
+import random
+import sys
+import time
+
+from logic import *
+
+import puzzle
+
+
+def timed(knowledge, queries, engine, processes):
+    """Returns (answers, seconds) for checking every query with engine."""
+    start = time.perf_counter()
+    answers = [
+        model_check(knowledge, query, engine, processes) for query in queries
+    ]
+    return answers, time.perf_counter() - start
+
+
+def compare(name, knowledge, queries, processes):
+    """Times both engines on one knowledge base and checks the answers."""
+    serial, serial_time = timed(knowledge, queries, "bitwise", processes)
+    parallel, parallel_time = timed(knowledge, queries, "parallel", processes)
+    if serial != parallel:
+        raise Exception(f"parallel disagrees with bitwise on {name}")
+    print(f"{name:>12}: bitwise {serial_time:7.3f} s, "
+          f"parallel {parallel_time:7.3f} s, "
+          f"{serial_time / parallel_time:5.2f}x")
+
+
+def exactly_one(size):
+    """
+    Returns (knowledge, queries) where knowledge says exactly one of
+    `size` symbols is true. The first query is entailed, so every model
+    must be checked; the others are not, and have counter-models at
+    different depths of the search.
+    """
+    symbols = [Symbol(f"x{i:02}") for i in range(size)]
+    knowledge = And(Or(*symbols))
+    for i in range(size):
+        for j in range(i + 1, size):
+            knowledge.add(Implication(symbols[i], Not(symbols[j])))
+    queries = [Not(And(symbols[0], symbols[1])), Not(symbols[0]),
+               Not(symbols[-1])]
+    return knowledge, queries
+
+
+def statement(rng, people, depth):
+    """Returns a random claim about who among people is a knight or knave."""
+    if depth == 0 or rng.random() < 0.3:
+        knight, knave = rng.choice(people)
+        return rng.choice([knight, knave])
+    kind = rng.choice([Not, And, Or])
+    if kind == Not:
+        return Not(statement(rng, people, depth - 1))
+    return kind(*[
+        statement(rng, people, depth - 1) for _ in range(rng.randint(2, 3))
+    ])
+
+
+def generate(count, seed=0):
+    """
+    Returns `count` random knights and knaves puzzles over the symbols of
+    puzzle.py, each as (knowledge, symbols). Everyone is a knight or a
+    knave but not both, and each person who speaks makes one claim that
+    is true if and only if they are a knight.
+    """
+    rng = random.Random(seed)
+    people = [(puzzle.AKnight, puzzle.AKnave), (puzzle.BKnight, puzzle.BKnave),
+              (puzzle.CKnight, puzzle.CKnave)]
+    symbols = [symbol for person in people for symbol in person]
+    puzzles = []
+    for _ in range(count):
+        knowledge = And()
+        for knight, knave in people:
+            knowledge.add(Or(knight, knave))
+            knowledge.add(Implication(knight, Not(knave)))
+            knowledge.add(Implication(knave, Not(knight)))
+            if rng.random() < 0.8:
+                claim = statement(rng, people, 2)
+                knowledge.add(Implication(knight, claim))
+                knowledge.add(Implication(knave, Not(claim)))
+        puzzles.append((knowledge, symbols))
+    return puzzles
+
+
+def batch(count):
+    """Times solving generated puzzles one by one and as one batch."""
+    puzzles = generate(count)
+    print(f"{count} puzzles")
+
+    start = time.perf_counter()
+    single = [
+        [model_check(knowledge, symbol) for symbol in symbols]
+        for knowledge, symbols in puzzles
+    ]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = batch_model_check(puzzles)
+    batch_time = time.perf_counter() - start
+
+    if single != batched:
+        raise Exception("batch_model_check disagrees with model_check")
+    solved = sum(
+        sum(entailed) == len(entailed) // 2 for entailed in batched
+    )
+    print(f"{'model_check':>17}: {single_time:7.3f} s, "
+          f"{count / single_time:9.0f} puzzles/s")
+    print(f"{'batch_model_check':>17}: {batch_time:7.3f} s, "
+          f"{count / batch_time:9.0f} puzzles/s, "
+          f"{single_time / batch_time:5.2f}x")
+    print(f"{solved} puzzles have a unique solution")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        if len(sys.argv) > 3:
+            sys.exit("Usage: python benchmark.py batch [puzzles]")
+        batch(int(sys.argv[2]) if len(sys.argv) == 3 else 5000)
+        return
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark.py [processes]")
+    processes = int(sys.argv[1]) if len(sys.argv) == 2 else os.cpu_count()
+    print(f"{processes} processes")
+
+    symbols = [puzzle.AKnight, puzzle.AKnave, puzzle.BKnight,
+               puzzle.BKnave, puzzle.CKnight, puzzle.CKnave]
+    knowledge = [puzzle.knowledge0, puzzle.knowledge1,
+                 puzzle.knowledge2, puzzle.knowledge3]
+    for number, puzzle_knowledge in enumerate(knowledge):
+        compare(f"puzzle {number}", puzzle_knowledge, symbols, processes)
+
+    for size in range(24, 28):
+        compare(f"{size} symbols", *exactly_one(size), processes)
+
+
+if __name__ == "__main__":
+    main()
@@ -95,13 +95,16 @@ def main():
         ("Puzzle 2", knowledge2),
         ("Puzzle 3", knowledge3)
     ]
-    for puzzle, knowledge in puzzles:
+    results = batch_model_check([
+        (knowledge, symbols) for _, knowledge in puzzles
+    ])
+    for (puzzle, knowledge), entailed in zip(puzzles, results):
         print(puzzle)
         if len(knowledge.conjuncts) == 0:
             print("    Not yet implemented.")
         else:
-            for symbol in symbols:
-                if model_check(knowledge, symbol):
+            for symbol, entails in zip(symbols, entailed):
+                if entails:
                     print(f"    {symbol}")
 
 
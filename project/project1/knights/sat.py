@@ -0,0 +1,335 @@
+"""
+Boolean satisfiability
+
+A CNF holds clauses over integer variables 1, 2, ..., where literal v
+means variable v is true and -v means it is false. Named variables stand
+for logic symbols; the others are introduced by the Tseitin encoding to
+name subformulas, so formulas convert to clauses without blowing up.
+
+solve() is a conflict-driven DPLL solver: unit propagation with two
+watched literals per clause, clause learning at the first unique
+implication point, non-chronological backjumping, activity-ordered
+decisions and restarts on the Luby sequence.
+"""
+
+import heapq
+
+# Conflicts between restarts, times the next term of the Luby sequence
+RESTART_INTERVAL = 100
+
+
+class CNF():
+
+    def __init__(self):
+        """Create an empty formula, which is true."""
+        self.names = {}
+        self.num_variables = 0
+        self.clauses = []
+
+        # Literals already defined for gates, by (gate, inputs)
+        self.gates = {}
+
+    def variable(self, name):
+        """Returns the variable of a named symbol."""
+        if name not in self.names:
+            self.names[name] = self.new_variable()
+        return self.names[name]
+
+    def new_variable(self):
+        """Returns a new unnamed variable."""
+        self.num_variables += 1
+        return self.num_variables
+
+    def add(self, clause):
+        """Adds a clause, a list of literals at least one of which is true."""
+        self.clauses.append(list(clause))
+
+    def true(self):
+        """Returns a literal that is always true."""
+        if ("true",) not in self.gates:
+            literal = self.new_variable()
+            self.add([literal])
+            self.gates[("true",)] = literal
+        return self.gates[("true",)]
+
+    def conjunction(self, literals):
+        """Returns a literal that is true when all the literals are."""
+        literals = tuple(sorted(set(literals)))
+        if not literals:
+            return self.true()
+        if len(literals) == 1:
+            return literals[0]
+        key = ("and", literals)
+        if key not in self.gates:
+            gate = self.new_variable()
+            for literal in literals:
+                self.add([-gate, literal])
+            self.add([gate] + [-literal for literal in literals])
+            self.gates[key] = gate
+        return self.gates[key]
+
+    def disjunction(self, literals):
+        """Returns a literal that is true when any of the literals is."""
+        return -self.conjunction([-literal for literal in literals])
+
+    def equivalence(self, left, right):
+        """Returns a literal that is true when two literals are equal."""
+        left, right = sorted([left, right])
+        key = ("iff", left, right)
+        if key not in self.gates:
+            gate = self.new_variable()
+            self.add([-gate, -left, right])
+            self.add([-gate, left, -right])
+            self.add([gate, left, right])
+            self.add([gate, -left, -right])
+            self.gates[key] = gate
+        return self.gates[key]
+
+
+def luby(index):
+    """Returns term `index` of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    size, power = 1, 1
+    while size < index + 1:
+        size, power = 2 * size + 1, 2 * power
+    while size - 1 != index:
+        size = (size - 1) // 2
+        power //= 2
+        index %= size
+    return power
+
+
+def solve(cnf):
+    """
+    Returns a satisfying model of a CNF as a dictionary mapping each
+    variable name to its truth value, or None if it is unsatisfiable.
+    """
+    solver = Solver(cnf.num_variables, cnf.clauses)
+    if not solver.solve():
+        return None
+    return {
+        name: solver.values[variable] == 1
+        for name, variable in cnf.names.items()
+    }
+
+
+class Solver():
+
+    def __init__(self, num_variables, clauses):
+        """Create a solver for clauses over variables 1 to num_variables."""
+        self.num_variables = num_variables
+
+        # Value (1 true, -1 false, 0 unassigned), decision level and
+        # reason clause of each variable
+        self.values = [0] * (num_variables + 1)
+        self.levels = [0] * (num_variables + 1)
+        self.reasons = [None] * (num_variables + 1)
+
+        # Assigned literals in order, where each decision level starts
+        # and how many have been propagated
+        self.trail = []
+        self.limits = []
+        self.propagated = 0
+
+        # Clauses watching each literal, at index 2 * variable + negative
+        self.watches = [[] for _ in range(2 * num_variables + 2)]
+
+        # Variables by activity for decisions, and last value of each
+        self.activity = [0.0] * (num_variables + 1)
+        self.increment = 1.0
+        self.heap = [(0.0, variable) for variable in range(1, num_variables + 1)]
+        self.phases = [-1] * (num_variables + 1)
+
+        self.conflict = False
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def value(self, literal):
+        """Returns 1 if a literal is true, -1 if false, 0 if unassigned."""
+        value = self.values[abs(literal)]
+        return value if literal > 0 else -value
+
+    def watch(self, literal, clause):
+        """Adds a clause to the clauses watching a literal."""
+        self.watches[2 * abs(literal) + (literal < 0)].append(clause)
+
+    def add_clause(self, clause):
+        """Adds an input clause, before solving starts."""
+        clause = list(dict.fromkeys(clause))
+        if any(-literal in clause for literal in clause):
+            return
+        if not clause:
+            self.conflict = True
+        elif len(clause) == 1:
+            if self.value(clause[0]) == -1:
+                self.conflict = True
+            elif self.value(clause[0]) == 0:
+                self.assign(clause[0], None)
+        else:
+            self.watch(clause[0], clause)
+            self.watch(clause[1], clause)
+
+    def assign(self, literal, reason):
+        """Makes a literal true at the current decision level."""
+        variable = abs(literal)
+        self.values[variable] = 1 if literal > 0 else -1
+        self.levels[variable] = len(self.limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Assigns the literals implied by unit clauses, and returns a clause
+        that became false, or None if there was no conflict. The literal a
+        clause implies is kept first in it, and watched.
+        """
+        values = self.values
+        trail = self.trail
+        while self.propagated < len(trail):
+            false = -trail[self.propagated]
+            self.propagated += 1
+            index = 2 * abs(false) + (false < 0)
+            watchers = self.watches[index]
+            kept = []
+            for position, clause in enumerate(watchers):
+
+                # Make the false literal the second watch
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = clause[0]
+                value = values[first] if first > 0 else -values[-first]
+                if value == 1:
+                    kept.append(clause)
+                    continue
+
+                # Watch another literal that is not false, if any
+                for other in range(2, len(clause)):
+                    literal = clause[other]
+                    if (values[literal] if literal > 0 else -values[-literal]) != -1:
+                        clause[1], clause[other] = literal, clause[1]
+                        self.watch(literal, clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if value == -1:
+                        kept.extend(watchers[position + 1:])
+                        self.watches[index] = kept
+                        return clause
+                    self.assign(first, clause)
+            self.watches[index] = kept
+        return None
+
+    def analyze(self, conflict):
+        """
+        Returns a learned clause that is implied by the conflict, with its
+        one literal from the current decision level first, and the level
+        to jump back to.
+        """
+        level = len(self.limits)
+        learned = [None]
+        seen = set()
+        pending = 0
+        position = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for literal in clause:
+                variable = abs(literal)
+                if variable in seen or self.levels[variable] == 0:
+                    continue
+                seen.add(variable)
+                self.bump(variable)
+                if self.levels[variable] == level:
+                    pending += 1
+                else:
+                    learned.append(literal)
+
+            # Resolve with the reason of the latest literal involved
+            while abs(self.trail[position]) not in seen:
+                position -= 1
+            literal = self.trail[position]
+            position -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[abs(literal)][1:]
+        learned[0] = -literal
+
+        # Jump back to the latest level of the other literals, which
+        # goes second so that it is watched
+        if len(learned) == 1:
+            return learned, 0
+        latest = max(range(1, len(learned)),
+                     key=lambda i: self.levels[abs(learned[i])])
+        learned[1], learned[latest] = learned[latest], learned[1]
+        return learned, self.levels[abs(learned[1])]
+
+    def bump(self, variable):
+        """Raises the activity of a variable that took part in a conflict."""
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.increment *= 1e-100
+            self.heap = [
+                (-self.activity[v], v)
+                for v in range(1, self.num_variables + 1)
+                if self.values[v] == 0
+            ]
+            heapq.heapify(self.heap)
+        if self.values[variable] == 0:
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+
+    def backtrack(self, level):
+        """Unassigns every literal above a decision level."""
+        if len(self.limits) <= level:
+            return
+        for literal in self.trail[self.limits[level]:]:
+            variable = abs(literal)
+            self.phases[variable] = self.values[variable]
+            self.values[variable] = 0
+            self.reasons[variable] = None
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+        del self.trail[self.limits[level]:]
+        del self.limits[level:]
+        self.propagated = len(self.trail)
+
+    def decide(self):
+        """
+        Returns the unassigned variable with the highest activity, or None
+        if every variable is assigned.
+        """
+        while self.heap:
+            activity, variable = heapq.heappop(self.heap)
+            if self.values[variable] == 0 and -activity == self.activity[variable]:
+                return variable
+        return None
+
+    def solve(self):
+        """Returns True if the clauses are satisfiable, False otherwise."""
+        if self.conflict:
+            return False
+        restarts = 0
+        conflicts = 0
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                if not self.limits:
+                    return False
+                learned, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learned) > 1:
+                    self.watch(learned[0], learned)
+                    self.watch(learned[1], learned)
+                self.assign(learned[0], learned)
+                self.increment /= 0.95
+
+                # Start over from the top, keeping what was learned
+                conflicts += 1
+                if conflicts >= RESTART_INTERVAL * luby(restarts):
+                    restarts += 1
+                    conflicts = 0
+                    self.backtrack(0)
+            else:
+                variable = self.decide()
+                if variable is None:
+                    return True
+                self.limits.append(len(self.trail))
+                self.assign(variable * self.phases[variable], None)
@@ -0,0 +1,84 @@
+"""
+Benchmark of MinesweeperAI inference
+
+Usage: python benchmark.py [games]
+
+Plays games on expert boards, 16 rows by 30 columns with 99 mines,
+making a safe move whenever the AI knows one and a random move
+otherwise, and prints the time add_knowledge takes per move over the
+course of a game, along with the largest knowledge base reached.
+"""
+
+import random
+import sys
+import time
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+HEIGHT = 16
+WIDTH = 30
+MINES = 99
+
+# Moves of a game are timed in this many groups, first to last
+STAGES = 4
+
+
+def play(seed):
+    """
+    Plays one game, and returns whether it was won, the seconds each
+    call to add_knowledge took, and the most sentences known at once.
+    """
+    random.seed(seed)
+    game = Minesweeper(height=HEIGHT, width=WIDTH, mines=MINES)
+    ai = MinesweeperAI(height=HEIGHT, width=WIDTH)
+    times = []
+    largest = 0
+    while True:
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+            if move is None:
+                return True, times, largest
+        if game.is_mine(move):
+            return False, times, largest
+        nearby = game.nearby_mines(move)
+        start = time.perf_counter()
+        ai.add_knowledge(move, nearby)
+        times.append(time.perf_counter() - start)
+        largest = max(largest, len(ai.sentences))
+        if len(ai.moves_made) + MINES == HEIGHT * WIDTH:
+            return True, times, largest
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python benchmark.py [games]")
+    games = int(sys.argv[1]) if len(sys.argv) == 2 else 200
+
+    won = 0
+    largest = 0
+    moves = 0
+    total = 0
+    slowest = 0
+    stages = [[] for _ in range(STAGES)]
+    for seed in range(games):
+        result, times, sentences = play(seed)
+        won += result
+        largest = max(largest, sentences)
+        moves += len(times)
+        total += sum(times)
+        slowest = max(slowest, max(times, default=0))
+        for i, elapsed in enumerate(times):
+            stages[i * STAGES // len(times)].append(elapsed)
+
+    print(f"{games} games on {HEIGHT}x{WIDTH} with {MINES} mines: "
+          f"{won} won, {moves} moves, up to {largest} sentences")
+    print(f"add_knowledge: {total / moves * 1e6:8.1f} us per move, "
+          f"slowest {slowest * 1e3:.2f} ms")
+    for stage, times in enumerate(stages):
+        print(f"{stage * 100 // STAGES:>5}-{(stage + 1) * 100 // STAGES:>3}% "
+              f"of moves: {sum(times) / len(times) * 1e6:8.1f} us per move")
+
+
+if __name__ == "__main__":
+    main()
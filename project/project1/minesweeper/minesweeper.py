@@ -1,5 +1,7 @@
 import itertools
 import random
+from collections import deque
+from collections.abc import MutableSequence
 
 
 class Minesweeper():
@@ -135,9 +137,58 @@ class Sentence():
             self.cells.remove(cell)
 
 
+class Knowledge(MutableSequence):
+    """
+    List of the sentences an AI knows, in the order they were added.
+    Appending adds a sentence to the AI's index; any other change
+    rebuilds the index from the changed list. Like the index, it drops
+    empty and repeated sentences.
+    """
+
+    def __init__(self, ai):
+        self.ai = ai
+
+    def __getitem__(self, index):
+        return list(self.ai.sentences.values())[index]
+
+    def __len__(self):
+        return len(self.ai.sentences)
+
+    def __iter__(self):
+        return iter(list(self.ai.sentences.values()))
+
+    def __setitem__(self, index, value):
+        sentences = list(self.ai.sentences.values())
+        sentences[index] = value
+        self.ai.knowledge = sentences
+
+    def __delitem__(self, index):
+        sentences = list(self.ai.sentences.values())
+        del sentences[index]
+        self.ai.knowledge = sentences
+
+    def insert(self, index, sentence):
+        if index >= len(self):
+            self.ai.add_sentence(sentence)
+        else:
+            sentences = list(self.ai.sentences.values())
+            sentences.insert(index, sentence)
+            self.ai.knowledge = sentences
+
+    def __repr__(self):
+        return repr(list(self))
+
+
 class MinesweeperAI():
     """
     Minesweeper game player
+
+    Sentences are kept once each, by their cells and count, and indexed
+    by the cells they mention. Marking a cell only revisits the sentences
+    that mention it, and sentences that are new or have changed wait in a
+    queue to be checked for known mines and safes, and against the
+    sentences they share a cell with for subsets. So the work per move
+    depends on the sentences near it, not on the size of the board.
     """
 
     def __init__(self, height=8, width=8):
@@ -153,26 +204,116 @@ class MinesweeperAI():
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+        # Sentences about the game known to be true, by key
+        self.sentences = {}
+
+        # Keys of the sentences mentioning each cell
+        self.sentences_by_cell = {}
+
+        # Keys of the sentences still to be inferred from
+        self.pending = deque()
+
+    @property
+    def knowledge(self):
+        """List of sentences about the game known to be true."""
+        return Knowledge(self)
+
+    @knowledge.setter
+    def knowledge(self, sentences):
+        sentences = list(sentences)
+        self.sentences = {}
+        self.sentences_by_cell = {}
+        self.pending = deque()
+        for sentence in sentences:
+            self.add_sentence(sentence)
 
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
         to mark that cell as a mine as well.
         """
+        if cell in self.mines:
+            return
         self.mines.add(cell)
-        for sentence in self.knowledge:
+        for sentence in self.remove_sentences(cell):
             sentence.mark_mine(cell)
+            self.add_sentence(sentence)
 
     def mark_safe(self, cell):
         """
         Marks a cell as safe, and updates all knowledge
         to mark that cell as safe as well.
         """
+        if cell in self.safes:
+            return
         self.safes.add(cell)
-        for sentence in self.knowledge:
+        for sentence in self.remove_sentences(cell):
             sentence.mark_safe(cell)
+            self.add_sentence(sentence)
+
+    def add_sentence(self, sentence):
+        """
+        Adds a sentence to the knowledge base and queues it for inference,
+        unless it is empty or already known.
+        """
+        key = (frozenset(sentence.cells), sentence.count)
+        if not sentence.cells or key in self.sentences:
+            return
+        self.sentences[key] = sentence
+        for cell in sentence.cells:
+            self.sentences_by_cell.setdefault(cell, set()).add(key)
+        self.pending.append(key)
+
+    def remove_sentences(self, cell):
+        """
+        Removes the sentences mentioning a cell from the knowledge base,
+        and returns them.
+        """
+        removed = []
+        for key in self.sentences_by_cell.pop(cell, ()):
+            for other in key[0]:
+                if other != cell:
+                    self.sentences_by_cell[other].discard(key)
+            removed.append(self.sentences.pop(key))
+        return removed
+
+    def infer(self):
+        """
+        Draws conclusions from the queued sentences until there are none
+        left: marks the cells of a sentence as mines or safes when they
+        are known, and otherwise adds the difference between it and every
+        sentence it contains or is contained by.
+        """
+        while self.pending:
+            key = self.pending.popleft()
+            sentence = self.sentences.get(key)
+            if sentence is None:
+                continue
+            cells, count = key
+
+            if sentence.known_safes():
+                for cell in cells:
+                    self.mark_safe(cell)
+                continue
+            if sentence.known_mines():
+                for cell in cells:
+                    self.mark_mine(cell)
+                continue
+
+            # Only sentences sharing a cell can be subsets of each other
+            neighbors = set()
+            for cell in cells:
+                neighbors |= self.sentences_by_cell[cell]
+            neighbors.discard(key)
+            for other_cells, other_count in neighbors:
+                if other_cells < cells:
+                    self.add_sentence(
+                        Sentence(cells - other_cells, count - other_count)
+                    )
+                elif cells < other_cells:
+                    self.add_sentence(
+                        Sentence(other_cells - cells, other_count - count)
+                    )
 
     def add_knowledge(self, cell, count):
         """
@@ -207,88 +348,11 @@ class MinesweeperAI():
         possible_cells -= self.safes
         neighbor_known_mines = len(possible_cells & self.mines)
         possible_cells -= self.mines
-        possible_cells -= self.moves_made
-        self.knowledge.append(Sentence(possible_cells, count-neighbor_known_mines))
-
-        # mark any additional cells as safe or as mines
-        # if it can be concluded based on the AI's knowledge base
-        def add(self):
-            """
-            return a positive number if there is anything updated
-            """
-            cnt = 0
-            new_mines = []
-            new_safes = []
-            for sentence in self.knowledge:
-                if sentence.known_mines():
-                    cnt += 1
-                    new_mines += list(sentence.known_mines())
-                    self.knowledge.remove(sentence)
-                if sentence.known_safes():
-                    cnt += 1
-                    new_safes += list(sentence.known_safes())
-                    self.knowledge.remove(sentence)
-            while True:
-                while len(new_safes) != 0:
-                    safe = new_safes.pop()
-                    self.mark_safe(safe)
-                    for sentence in self.knowledge:
-                        if sentence.known_mines():
-                            cnt += 1
-                            new_mines += list(sentence.known_mines())
-                        if sentence.known_safes():
-                            cnt += 1
-                            new_safes += list(sentence.known_safes())
-                while len(new_mines) != 0:
-                    mine = new_mines.pop()
-                    self.mark_mine(mine)
-                    for sentence in self.knowledge:
-                        if sentence.known_mines():
-                            cnt += 1
-                            new_mines += list(sentence.known_mines())
-                        if sentence.known_safes():
-                            cnt += 1
-                            new_safes += list(sentence.known_safes())
-                if len(new_mines) == 0 and len(new_safes) == 0:
-                    return cnt
-
-        # add any new sentences to the AI's knowledge base
-        # if they can be inferred from existing knowledge
-        def infer(self):
-            """
-            return a positive number if there is anything updated
-            """
-            cnt = 0
-            for i in range(len(self.knowledge)):
-                for j in range(i + 1, len(self.knowledge)):
-                    flag = False
-                    sentence1, sentence2 = self.knowledge[i], self.knowledge[j]
-                    if sentence1.cells < sentence2.cells:
-                        newpart = sentence2.cells - sentence1.cells
-                        mine_cnt = sentence2.count - sentence1.count
-                    elif sentence1.cells > sentence2.cells:
-                        newpart = sentence1.cells - sentence2.cells
-                        mine_cnt = sentence1.count - sentence2.count
-                    else:
-                        continue
-                    if not newpart:
-                        continue
-                    tmp = Sentence(newpart, mine_cnt)
-                    for sentence in self.knowledge:
-                        if tmp == sentence:
-                            flag = True
-                            break
-                    if flag:
-                        continue
-                    self.knowledge.append(tmp)
-                    cnt += 1
-            return cnt
-        
-        while True:
-            add_cnt = add(self)
-            infer_cnt = infer(self)
-            if not add_cnt and not infer_cnt:
-                break
+        self.add_sentence(Sentence(possible_cells, count-neighbor_known_mines))
+
+        # mark any additional cells as safe or as mines, and add any
+        # new sentences, that can be concluded from the knowledge base
+        self.infer()
 
     def make_safe_move(self):
         """
@@ -312,8 +376,8 @@ class MinesweeperAI():
             2) are not known to be mines
         """
         possible_moves = set()
-        for i in range(self.width):
-            for j in range(self.height):
+        for i in range(self.height):
+            for j in range(self.width):
                 possible_moves.add((i, j))
         possible_moves -= self.moves_made
         possible_moves -= self.mines
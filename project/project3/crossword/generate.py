@@ -43,46 +43,45 @@ class CrosswordCreator():
                     print("█", end="")
             print()
 
-    def save(self, assignment, filename):
+    def save(self, assignment, filename, tile_size=None):
         """
-        Save crossword assignment to an image file.
+        Save crossword assignment to an image file, or to tiles of at
+        most `tile_size` cells a side.
         """
-        from PIL import Image, ImageDraw, ImageFont
+        from PIL import ImageDraw, ImageFont
+        import render
         cell_size = 100
         cell_border = 2
         interior_size = cell_size - 2 * cell_border
         letters = self.letter_grid(assignment)
-
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.crossword.width * cell_size,
-             self.crossword.height * cell_size),
-            "black"
-        )
         font = ImageFont.truetype("assets/fonts/OpenSans-Regular.ttf", 80)
-        draw = ImageDraw.Draw(img)
 
-        for i in range(self.crossword.height):
-            for j in range(self.crossword.width):
+        # Open cells are white, blocked cells stay black
+        grid = [
+            [1 if open_cell else 0 for open_cell in row]
+            for row in self.crossword.structure
+        ]
 
-                rect = [
-                    (j * cell_size + cell_border,
-                     i * cell_size + cell_border),
-                    ((j + 1) * cell_size - cell_border,
-                     (i + 1) * cell_size - cell_border)
-                ]
-                if self.crossword.structure[i][j]:
-                    draw.rectangle(rect, fill="white")
+        def draw_letters(img, top, left, bottom, right):
+            """Draws the letters of the cells in one image."""
+            draw = ImageDraw.Draw(img)
+            for i in range(top, bottom):
+                for j in range(left, right):
                     if letters[i][j]:
+                        x, y = render.corner(
+                            i - top, j - left, cell_size, cell_border
+                        )
                         w, h = draw.textsize(letters[i][j], font=font)
                         draw.text(
-                            (rect[0][0] + ((interior_size - w) / 2),
-                             rect[0][1] + ((interior_size - h) / 2) - 10),
+                            (x + ((interior_size - w) / 2),
+                             y + ((interior_size - h) / 2) - 10),
                             letters[i][j], fill="black", font=font
                         )
 
-        img.save(filename)
+        return render.save(
+            filename, grid, ["black", "white"], cell_size, cell_border,
+            overlay=draw_letters, tile_size=tile_size
+        )
 
     def solve(self):
         """